@@ -0,0 +1,221 @@
+# ------------------------------------------------- #
+# Headless API: dezelfde verwachting, zonder Streamlit #
+# ------------------------------------------------- #
+#
+# Dezelfde fetch-, decodeer- en cachefuncties als het dashboard, maar als
+# kleine Starlette-app. Het antwoord (JSON of Arrow IPC) wordt per locatie,
+# tabel en kolomkeuze bewaard tot de volgende modelrun, dus een gecachete
+# locatie kost alleen een dict-lookup en het versturen.
+#
+# Gebruik:
+#   python api.py --poort 8000
+#   curl "localhost:8000/verwachting?q=Utrecht&tabel=uren&kolommen=Temperatuur (°C),Wind pijl"
+#   curl "localhost:8000/verwachting?lat=52.37&lon=4.89&tabel=fig2&formaat=arrow" -o fig2.arrow
+#
+# Endpoints:
+#   /verwachting  lat+lon of q; tabel=dagen|uren|fig2; kolommen=a,b; formaat=json|arrow
+#   /plaatsen     q
+#   /gezond       cache-statistieken
+
+import argparse
+import gzip
+import hashlib
+import json
+import time
+from contextlib import asynccontextmanager
+from email.utils import formatdate, parsedate_to_datetime
+from functools import lru_cache
+
+import numpy as np
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from geocode import zoek_plaats
+from knmi_historie import annoteer_dagen, laad_neerslag, maak_klimatologie
+from weer_async import haal_verwachting
+from weercache import WeerCache, verwachtingen_cache
+from weerdata import maak_dataframes, maak_fig2_dataframes, uur_labels
+
+# ---------------------------------------- End
+
+TABELLEN = ("dagen", "uren", "fig2")
+ARROW = "application/vnd.apache.arrow.stream"
+GZIP_MINIMUM = 500
+
+# (locatie, tabel, kolommen, formaat, ophaaltijd) -> (body, gzip-body, media type,
+# etag, last-modified); verloopt net als de verwachting zelf bij de volgende modelrun.
+# De gzip-versie wordt één keer gemaakt, niet per request door de middleware.
+antwoorden_cache = WeerCache(max_items=2048)
+
+
+class Fout(Exception):
+    def __init__(self, status, melding):
+        super().__init__(melding)
+        self.status = status
+        self.melding = melding
+
+
+# -----------------------
+# Data
+# -----------------------
+@lru_cache(maxsize=1)
+def klimatologie():
+    return maak_klimatologie(laad_neerslag())
+
+async def _locatie(params):
+    if "q" in params:
+        resultaten = await run_in_threadpool(zoek_plaats, params["q"])
+        if not resultaten:
+            raise Fout(404, f"Geen plaats gevonden voor '{params['q']}'")
+        return float(resultaten[0]["lat"]), float(resultaten[0]["lon"])
+    try:
+        lat, lon = float(params["lat"]), float(params["lon"])
+    except (KeyError, ValueError):
+        raise Fout(400, "Geef lat en lon, of q")
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise Fout(400, "lat/lon buiten bereik")
+    return lat, lon
+
+async def _verwachting(lat, lon):
+    # Snel pad: een verse verwachting uit de cache, zonder threadpool
+    data = verwachtingen_cache.get(verwachtingen_cache.sleutel(lat, lon))
+    if data is None:
+        # Ophalen (of de laatst goede teruggeven) blokkeert; niet op de event loop
+        data = await run_in_threadpool(haal_verwachting, lat, lon)
+    if not data:
+        raise Fout(502, "Open-Meteo gaf geen verwachting")
+    return data
+
+def _tabel(data, tabel):
+    if tabel == "dagen":
+        df_daily, _ = maak_dataframes(data)
+        return annoteer_dagen(df_daily, klimatologie())
+    if tabel == "uren":
+        _, df_hourly = maak_dataframes(data)
+        return uur_labels(df_hourly).reset_index()
+    hourly_dataframe, _ = maak_fig2_dataframes(data)
+    return hourly_dataframe.reset_index(drop=True)
+
+def _selecteer(df, kolommen):
+    if not kolommen:
+        return df
+    onbekend = [k for k in kolommen if k not in df.columns]
+    if onbekend:
+        raise Fout(400, f"Onbekende kolommen: {', '.join(onbekend)}. Beschikbaar: {', '.join(df.columns)}")
+    return df[list(kolommen)]
+
+def _serialiseer(df, formaat):
+    if formaat == "arrow":
+        import pyarrow as pa
+
+        tabel = pa.Table.from_pandas(df, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, tabel.schema) as writer:
+            writer.write_table(tabel)
+        return sink.getvalue().to_pybytes(), ARROW
+    # float32 wordt in JSON 9.3000001907; net als uur_labels naar float64 en op 1 decimaal
+    kolommen = df.select_dtypes(np.float32).columns
+    if len(kolommen):
+        df = df.assign(**{k: df[k].astype(np.float64).round(1) for k in kolommen})
+    body = df.to_json(orient="records", date_format="iso", force_ascii=False)
+    return body.encode("utf-8"), "application/json"
+
+def _bouw_antwoord(data, tabel, kolommen, formaat):
+    body, media_type = _serialiseer(_selecteer(_tabel(data, tabel), kolommen), formaat)
+    etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+    gewijzigd = data.get("opgehaald", time.time())
+    ingepakt = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MINIMUM else None
+    return body, ingepakt, media_type, etag, gewijzigd
+
+
+# -----------------------
+# Endpoints
+# -----------------------
+def _niet_gewijzigd(request, etag, gewijzigd):
+    if "if-none-match" in request.headers:
+        return etag in [e.strip() for e in request.headers["if-none-match"].split(",")]
+    if "if-modified-since" in request.headers:
+        try:
+            return int(gewijzigd) <= parsedate_to_datetime(request.headers["if-modified-since"]).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+async def verwachting(request):
+    params = request.query_params
+    tabel = params.get("tabel", "uren")
+    formaat = params.get("formaat", "json")
+    kolommen = tuple(k.strip() for k in params.get("kolommen", "").split(",") if k.strip())
+    try:
+        if tabel not in TABELLEN:
+            raise Fout(400, f"tabel moet een van {', '.join(TABELLEN)} zijn")
+        if formaat not in ("json", "arrow"):
+            raise Fout(400, "formaat moet json of arrow zijn")
+        lat, lon = await _locatie(params)
+        data = await _verwachting(lat, lon)
+
+        sleutel = (verwachtingen_cache.sleutel(lat, lon), tabel, kolommen, formaat, data.get("opgehaald"))
+        antwoord = antwoorden_cache.get(sleutel)
+        if antwoord is None:
+            # DataFrames, serialiseren en gzip kosten CPU; niet op de event loop
+            antwoord = await run_in_threadpool(_bouw_antwoord, data, tabel, kolommen, formaat)
+            antwoorden_cache.put(sleutel, antwoord)
+    except Fout as fout:
+        return JSONResponse({"fout": fout.melding}, status_code=fout.status)
+
+    body, ingepakt, media_type, etag, gewijzigd = antwoord
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(gewijzigd, usegmt=True),
+        "Cache-Control": "public, max-age=60",
+        "Vary": "Accept-Encoding",
+    }
+    if data.get("verouderd"):
+        headers["Warning"] = '110 - "Response is Stale"'
+    if _niet_gewijzigd(request, etag, gewijzigd):
+        return Response(status_code=304, headers=headers)
+    if ingepakt is not None and "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        body = ingepakt
+    return Response(body, media_type=media_type, headers=headers)
+
+async def plaatsen(request):
+    resultaten = await run_in_threadpool(zoek_plaats, request.query_params.get("q", ""))
+    return Response(json.dumps(resultaten, ensure_ascii=False).encode("utf-8"), media_type="application/json")
+
+async def gezond(request):
+    return JSONResponse({"verwachtingen": verwachtingen_cache.stats(), "antwoorden": antwoorden_cache.stats()})
+
+
+@asynccontextmanager
+async def opstarten(app):
+    # De klimatologie (CSV -> .npy en de index) bij het starten opbouwen, niet
+    # bij de eerste request voor de dagtabel
+    await run_in_threadpool(klimatologie)
+    yield
+
+
+app = Starlette(
+    routes=[
+        Route("/verwachting", verwachting),
+        Route("/plaatsen", plaatsen),
+        Route("/gezond", gezond),
+    ],
+    middleware=[Middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM)],
+    lifespan=opstarten,
+)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Headless weer-API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--poort", type=int, default=8000)
+    args = parser.parse_args()
+    uvicorn.run(app, host=args.host, port=args.poort, log_level="warning")
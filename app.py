@@ -3,13 +3,14 @@ import requests
 import pandas as pd
 from datetime import datetime, date, timedelta
 import locale
+import os
 
 # -----------------------
 # Functies
 # -----------------------
 @st.cache_data(show_spinner=False)
 def zoek_plaats(query):
-    url = "https://nominatim.openstreetmap.org/search"
+    url = os.environ.get("NOMINATIM_URL", "https://nominatim.openstreetmap.org/search")
     params = {"q": query, "format": "json", "limit": 5, "addressdetails": 1}
     resp = requests.get(url, params=params, headers={"User-Agent": "streamlit-app"})
     return resp.json() if resp.status_code == 200 else []
@@ -46,7 +47,7 @@ def windrichting_cardinaal(degree):
 
 @st.cache_data(show_spinner=False)
 def haal_open_meteo(lat, lon):
-    om_url = "https://api.open-meteo.com/v1/forecast"
+    om_url = os.environ.get("OPEN_METEO_URL", "https://api.open-meteo.com/v1/forecast")
     params = {
         "latitude": lat, "longitude": lon,
         "daily": "temperature_2m_max,temperature_2m_min,weather_code,sunrise,sunset",
@@ -0,0 +1,179 @@
+# ---------------------------------------------------- #
+# Open-Meteo archief: tientallen jaren uurdata per plek #
+# ---------------------------------------------------- #
+#
+# Haalt historische uurdata op via de archief-API, in stukken van één jaar per
+# locatie. De stukken worden met een begrensd aantal tegelijk gedownload en
+# elk direct als Parquet weggeschreven in een gepartitioneerde map:
+#
+#   .cache_archief/locatie=<naam>/jaar=<jjjj>/uurdata.parquet
+#
+# Zo staat er nooit meer dan een handvol jaren in het geheugen. Welke stukken
+# klaar zijn staat in _voortgang.json; na een fout of onderbreking gaat een
+# nieuwe run verder waar de vorige gebleven was.
+#
+# Gebruik:
+#   python archief.py Amsterdam=52.37,4.89 Schellingwoude=52.38,4.98 --van 1980-01-01
+
+import argparse
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from weerdata import lees_blok, openmeteo_client
+
+# ---------------------------------------- End
+
+ARCHIEF_URL = os.environ.get("OPEN_METEO_ARCHIEF_URL", "https://archive-api.open-meteo.com/v1/archive")
+ARCHIEF_MAP = Path(__file__).resolve().parent / ".cache_archief"
+VOORTGANG = "_voortgang.json"
+
+ARCHIEF_VARS = ["temperature_2m", "precipitation", "rain", "wind_speed_10m", "wind_direction_10m", "weather_code"]
+
+# Het archief (ERA5) loopt ongeveer 5 dagen achter. Een stuk dat daarin valt
+# wordt wel opgeslagen, maar niet als klaar gemarkeerd.
+ARCHIEF_VERTRAGING = 5
+# Open-Meteo begrenst het aantal requests per minuut; een paar tegelijk is genoeg
+MAX_TEGELIJK = 4
+EERSTE_DATUM = date(1940, 1, 1)
+
+
+# -----------------------
+# Stukken en voortgang
+# -----------------------
+def stukken(van, tot):
+    # Periode [van, tot] opgeknipt in kalenderjaren: [(jaar, begin, eind), ...]
+    return [(jaar, max(van, date(jaar, 1, 1)), min(tot, date(jaar, 12, 31)))
+            for jaar in range(van.year, tot.year + 1)]
+
+def stuk_pad(map_, naam, jaar):
+    return Path(map_) / f"locatie={naam}" / f"jaar={jaar}" / "uurdata.parquet"
+
+def lees_voortgang(map_):
+    pad = Path(map_) / VOORTGANG
+    if not pad.exists():
+        return {}
+    return json.loads(pad.read_text())
+
+def _schrijf_atomisch(pad, schrijf):
+    # Eerst naar een tijdelijk bestand, dan hernoemen: een afgebroken run laat
+    # nooit een half bestand achter
+    pad.parent.mkdir(parents=True, exist_ok=True)
+    tmp = pad.with_name(pad.name + ".tmp")
+    schrijf(tmp)
+    os.replace(tmp, pad)
+
+
+# -----------------------
+# Downloaden
+# -----------------------
+def archief_params(lat, lon, begin, eind):
+    return {
+        "latitude": lat, "longitude": lon,
+        "start_date": begin.isoformat(), "end_date": eind.isoformat(),
+        "hourly": ARCHIEF_VARS,
+        "timezone": "GMT",
+    }
+
+def download_stuk(lat, lon, begin, eind):
+    # Eén jaar uurdata als DataFrame met een UTC-tijdkolom en float32-waarden
+    response = openmeteo_client().weather_api(ARCHIEF_URL, params=archief_params(lat, lon, begin, eind))[0]
+    data = lees_blok(response.Hourly(), ARCHIEF_VARS, 0)
+    df = pd.DataFrame({naam: data[naam].astype(np.float32) for naam in ARCHIEF_VARS})
+    df.insert(0, "tijd", pd.to_datetime(data["time_utc"], unit="s", utc=True))
+    return df
+
+def haal_archief(locaties, van, tot=None, map_=ARCHIEF_MAP, max_tegelijk=MAX_TEGELIJK):
+    # locaties: {naam: (lat, lon)}. Geeft het aantal opgehaalde stukken en de
+    # mislukte stukken terug; bij mislukte stukken kan de run later herhaald worden.
+    tot = tot or date.today() - timedelta(days=1)
+    map_ = Path(map_)
+    voortgang = lees_voortgang(map_)
+    grens = date.today() - timedelta(days=ARCHIEF_VERTRAGING)
+    lock = threading.Lock()
+
+    taken = [(naam, lat, lon, jaar, begin, eind)
+             for naam, (lat, lon) in locaties.items()
+             for jaar, begin, eind in stukken(van, tot)
+             if str(jaar) not in voortgang.get(naam, {})
+             or voortgang[naam][str(jaar)] != [begin.isoformat(), eind.isoformat()]]
+
+    def doe(naam, lat, lon, jaar, begin, eind):
+        df = download_stuk(lat, lon, begin, eind)
+        _schrijf_atomisch(stuk_pad(map_, naam, jaar), lambda tmp: df.to_parquet(tmp, index=False))
+        if eind < grens:
+            # Checkpoint na elk stuk, zodat een crash hooguit de lopende stukken kost
+            with lock:
+                voortgang.setdefault(naam, {})[str(jaar)] = [begin.isoformat(), eind.isoformat()]
+                _schrijf_atomisch(map_ / VOORTGANG, lambda tmp: tmp.write_text(json.dumps(voortgang, indent=1)))
+
+    gelukt, mislukt = 0, []
+    with ThreadPoolExecutor(max_workers=max_tegelijk) as pool:
+        futures = {pool.submit(doe, *taak): taak for taak in taken}
+        for future in as_completed(futures):
+            naam, _, _, jaar, _, _ = futures[future]
+            try:
+                future.result()
+                gelukt += 1
+            except Exception as fout:
+                mislukt.append((naam, jaar, repr(fout)))
+    return gelukt, mislukt
+
+
+# -----------------------
+# Lezen
+# -----------------------
+def lees_archief(naam, van=None, tot=None, kolommen=None, map_=ARCHIEF_MAP):
+    # Leest alleen de jaarbestanden die de gevraagde periode raken
+    map_ = Path(map_) / f"locatie={naam}"
+    jaren = sorted(int(p.name.split("=")[1]) for p in map_.glob("jaar=*"))
+    if van:
+        jaren = [j for j in jaren if j >= van.year]
+    if tot:
+        jaren = [j for j in jaren if j <= tot.year]
+    if not jaren:
+        return pd.DataFrame(columns=["tijd"] + (kolommen or ARCHIEF_VARS))
+
+    lees = None if kolommen is None else ["tijd"] + list(kolommen)
+    df = pd.concat([pd.read_parquet(map_ / f"jaar={j}" / "uurdata.parquet", columns=lees) for j in jaren],
+                   ignore_index=True)
+    if van:
+        df = df[df["tijd"] >= pd.Timestamp(van, tz="UTC")]
+    if tot:
+        df = df[df["tijd"] < pd.Timestamp(tot + timedelta(days=1), tz="UTC")]
+    return df.reset_index(drop=True)
+
+
+# -----------------------
+# Command line
+# -----------------------
+def _locatie(tekst):
+    naam, coord = tekst.split("=")
+    lat, lon = coord.split(",")
+    return naam, (float(lat), float(lon))
+
+def main():
+    parser = argparse.ArgumentParser(description="Historische uurdata van Open-Meteo naar een lokale Parquet-opslag")
+    parser.add_argument("locaties", nargs="+", type=_locatie, help="naam=lat,lon")
+    parser.add_argument("--van", type=date.fromisoformat, default=EERSTE_DATUM)
+    parser.add_argument("--tot", type=date.fromisoformat)
+    parser.add_argument("--map", type=Path, default=ARCHIEF_MAP)
+    parser.add_argument("--tegelijk", type=int, default=MAX_TEGELIJK)
+    args = parser.parse_args()
+
+    gelukt, mislukt = haal_archief(dict(args.locaties), args.van, args.tot, args.map, args.tegelijk)
+    print(f"{gelukt} stukken opgehaald, {len(mislukt)} mislukt")
+    for naam, jaar, fout in sorted(mislukt):
+        print(f"  {naam} {jaar}: {fout}")
+    if mislukt:
+        raise SystemExit("Niet alles is binnen; draai opnieuw om verder te gaan.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# -------------------------------------------------- #
+# Benchmark: requests per seconde van api.py         #
+# -------------------------------------------------- #
+#
+# Start de stand-in en api.py (uvicorn, één worker) in eigen processen, vult
+# de cache voor een paar locaties en vuurt dan gelijktijdige requests af.
+# Gemeten wordt de doorvoer voor gecachete locaties, zoals in productie.
+#
+# Gebruik (vanuit de root van de repo):
+#   python benchmarks/api_doorvoer.py
+#   python benchmarks/api_doorvoer.py --duur 10 --gelijktijdig 32 --formaat arrow
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# ---------------------------------------- End
+
+ROOT = Path(__file__).resolve().parent.parent
+LOCATIES = [(52.37, 4.89), (52.09, 5.12), (51.92, 4.48), (53.22, 6.57), (51.44, 5.48)]
+
+
+# -----------------------
+# Functies
+# -----------------------
+def _wacht_op(url, poging=100):
+    import httpx
+
+    for _ in range(poging):
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError(f"{url} komt niet op")
+
+async def _belast(url, params, duur, gelijktijdig):
+    import httpx
+
+    tijden, statussen = [], {}
+    eind = time.perf_counter() + duur
+    async with httpx.AsyncClient(limits=httpx.Limits(max_connections=gelijktijdig)) as client:
+        async def werker():
+            while time.perf_counter() < eind:
+                start = time.perf_counter()
+                resp = await client.get(url, params=random.choice(params), headers={"Accept-Encoding": "gzip"})
+                tijden.append(time.perf_counter() - start)
+                statussen[resp.status_code] = statussen.get(resp.status_code, 0) + 1
+        await asyncio.gather(*(werker() for _ in range(gelijktijdig)))
+    return tijden, statussen
+
+def main():
+    parser = argparse.ArgumentParser(description="Doorvoer van api.py voor gecachete locaties")
+    parser.add_argument("--duur", type=float, default=5)
+    parser.add_argument("--gelijktijdig", type=int, default=16)
+    parser.add_argument("--tabel", default="uren")
+    parser.add_argument("--formaat", default="json")
+    parser.add_argument("--poort", type=int, default=8799)
+    args = parser.parse_args()
+
+    standin = subprocess.Popen([sys.executable, "benchmarks/standin_server.py", "--poort", str(args.poort + 1)], cwd=ROOT)
+    omgeving = {**os.environ,
+                "OPEN_METEO_URL": f"http://127.0.0.1:{args.poort + 1}/v1/forecast",
+                "NOMINATIM_URL": f"http://127.0.0.1:{args.poort + 1}/search"}
+    api = subprocess.Popen([sys.executable, "api.py", "--poort", str(args.poort)], cwd=ROOT, env=omgeving)
+    try:
+        url = f"http://127.0.0.1:{args.poort}/verwachting"
+        _wacht_op(f"http://127.0.0.1:{args.poort + 1}/search")
+        _wacht_op(f"http://127.0.0.1:{args.poort}/gezond")
+
+        params = [{"lat": lat, "lon": lon, "tabel": args.tabel, "formaat": args.formaat} for lat, lon in LOCATIES]
+        asyncio.run(_belast(url, params, 1, 2))  # cache vullen
+
+        tijden, statussen = asyncio.run(_belast(url, params, args.duur, args.gelijktijdig))
+        tijden.sort()
+        print(f"{len(tijden) / args.duur:8.0f} requests/s  ({args.gelijktijdig} gelijktijdig, {args.tabel}, {args.formaat})")
+        print(f"latentie p50 {statistics.median(tijden) * 1000:.1f} ms, p99 {tijden[math.ceil(0.99 * len(tijden)) - 1] * 1000:.1f} ms")
+        print(f"statussen: {statussen}")
+    finally:
+        api.terminate()
+        standin.terminate()
+
+
+if __name__ == "__main__":
+    main()
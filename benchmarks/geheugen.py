@@ -0,0 +1,91 @@
+# -------------------------------------------------- #
+# Benchmark: geheugen per locatie-dag van df_hourly  #
+# -------------------------------------------------- #
+#
+# Vergelijkt de oude uurtabel (object-strings voor de labels, float64) met de
+# compacte (float32, int8-codes, labels pas bij het tonen). Gemeten wordt het
+# geheugen in het proces en de grootte na pickle, want zo bewaart
+# st.cache_data zijn waarden. Draait zonder netwerk op een synthetische
+# verwachting van de stand-in.
+#
+# Gebruik (vanuit de root van de repo):
+#   python benchmarks/geheugen.py            # 10 dagen, 1 locatie
+#   python benchmarks/geheugen.py 50         # 50 locaties
+
+import pickle
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------- End
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+# -----------------------
+# Functies
+# -----------------------
+def verwachting(lat, lon):
+    # Een synthetische verwachting, via dezelfde FlatBuffers-decodering als de app
+    from openmeteo_sdk.WeatherApiResponse import WeatherApiResponse
+    from standin_server import naar_flatbuffer, synthetische_locatie
+    from weerdata import lees_response, verwachting_params
+
+    params = [(k, ",".join(map(str, v)) if isinstance(v, list) else str(v))
+              for k, v in verwachting_params(lat, lon).items()]
+    bericht = naar_flatbuffer(synthetische_locatie(params, lat, lon))
+    return lees_response(WeatherApiResponse.GetRootAs(bericht, 4))
+
+def oude_uurtabel(data):
+    # De uurtabel zoals maak_dataframes hem vóór de compacte opzet bouwde
+    from weercodes import weercode_emojis, weercode_omschrijvingen, wind_pijlen, windrichtingen_cardinaal
+
+    hourly = data["hourly"]
+    return pd.DataFrame({
+        "Tijd": pd.to_datetime(hourly["time"]),
+        "Temperatuur (°C)": np.round(hourly["temperature_2m"], 1).astype(np.float64),
+        "Neerslag (mm)": np.round(hourly["rain"], 1).astype(np.float64),
+        "Weer emoji": weercode_emojis(hourly["weather_code"]),
+        "Weer tekst": weercode_omschrijvingen(hourly["weather_code"]),
+        "Wind snelheid (km/h)": np.round(hourly["wind_speed_10m"], 1).astype(np.float64),
+        "Wind richting": windrichtingen_cardinaal(hourly["wind_direction_10m"]),
+        "Wind pijl": wind_pijlen(hourly["wind_direction_10m"]),
+    })
+
+def meet(tabellen, dagen):
+    geheugen = sum(df.memory_usage(deep=True).sum() for df in tabellen)
+    start = time.perf_counter()
+    blob = pickle.dumps(tabellen)
+    dump = time.perf_counter() - start
+    start = time.perf_counter()
+    pickle.loads(blob)
+    laad = time.perf_counter() - start
+    return geheugen / dagen, len(blob) / dagen, dump * 1000, laad * 1000
+
+def main(argv):
+    locaties = int(argv[0]) if argv else 1
+    sys.path.insert(0, str(ROOT))
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from weerdata import maak_dataframes, uur_labels
+
+    rng = np.random.default_rng(0)
+    data = [verwachting(50.8 + rng.random() * 2.7, 3.4 + rng.random() * 3.8) for _ in range(locaties)]
+    dagen = sum(len(d["hourly"]["time"]) for d in data) / 24
+
+    oud = [oude_uurtabel(d) for d in data]
+    nieuw = [maak_dataframes(d)[1] for d in data]
+    getoond = [uur_labels(df) for df in nieuw]
+
+    print(f"{locaties} locaties, {dagen:.0f} locatie-dagen\n")
+    print(f"{'uurtabel':<28}{'geheugen B/dag':>16}{'pickle B/dag':>14}{'dump ms':>10}{'load ms':>10}")
+    for naam, tabellen in [("oud (object, float64)", oud), ("compact (int8, float32)", nieuw),
+                           ("compact + labels (tonen)", getoond)]:
+        geheugen, blob, dump, laad = meet(tabellen, dagen)
+        print(f"{naam:<28}{geheugen:>16.0f}{blob:>14.0f}{dump:>10.2f}{laad:>10.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
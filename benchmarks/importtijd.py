@@ -0,0 +1,86 @@
+# ------------------------------------------------- #
+# Benchmark: opstart- en reruntijd van de apps      #
+# ------------------------------------------------- #
+#
+# Gebruik (vanuit de root van de repo):
+#   python benchmarks/importtijd.py            # beide scripts, 5 reruns
+#   python benchmarks/importtijd.py 20 app.py  # 20 reruns, alleen app.py
+#
+# Koude start: het script draait in een nieuw proces met `python -X importtime`.
+# Streamlit staat dan in bare mode en er is nog geen zoekterm, dus er gaat niets
+# over het netwerk. Per rerun: Streamlit's AppTest draait het script herhaald
+# in hetzelfde proces, zoals de server dat bij elke widget-wijziging doet.
+
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# ---------------------------------------- End
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS = ["Case2_KNMI_Data.py", "app.py"]
+TOP = 10
+
+REGEL = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+# -----------------------
+# Functies
+# -----------------------
+def koude_start(script):
+    start = time.perf_counter()
+    proces = subprocess.run(
+        [sys.executable, "-X", "importtime", script],
+        cwd=ROOT, capture_output=True, text=True,
+        env={**os.environ, "PYTHONWARNINGS": "ignore"},
+    )
+    wandklok = time.perf_counter() - start
+
+    totaal_self, top = 0, []
+    for regel in proces.stderr.splitlines():
+        m = REGEL.match(regel)
+        if not m:
+            continue
+        eigen, cumulatief, inspringing, module = int(m[1]), int(m[2]), m[3], m[4]
+        totaal_self += eigen
+        # Alleen modules die het script zelf importeert (niet inspringend)
+        if not inspringing:
+            top.append((cumulatief, module))
+    top.sort(reverse=True)
+    return wandklok, totaal_self / 1e6, top[:TOP]
+
+def reruns(script, aantal):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / script), default_timeout=60)
+    tijden = []
+    for _ in range(aantal + 1):
+        start = time.perf_counter()
+        at.run()
+        tijden.append(time.perf_counter() - start)
+    return tijden[0], tijden[1:]
+
+def main(argv):
+    aantal = int(argv[0]) if argv else 5
+    scripts = argv[1:] or SCRIPTS
+
+    for script in scripts:
+        print(f"\n=== {script} ===")
+        wandklok, imports, top = koude_start(script)
+        print(f"Koude start (nieuw proces): {wandklok*1000:8.1f} ms, waarvan imports {imports*1000:.1f} ms")
+        print("Zwaarste directe imports (cumulatief):")
+        for cumulatief, module in top:
+            print(f"  {cumulatief/1000:8.1f} ms  {module}")
+
+        eerste, rest = reruns(script, aantal)
+        print(f"Eerste run in AppTest:      {eerste*1000:8.1f} ms")
+        print(f"Rerun (mediaan van {aantal}):    {statistics.median(rest)*1000:8.1f} ms"
+              f"  (min {min(rest)*1000:.1f}, max {max(rest)*1000:.1f})")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,159 @@
+# -------------------------------------------------- #
+# Benchmark: reruntijd per pagina en optiecombinatie #
+# -------------------------------------------------- #
+#
+# Draait Case2_KNMI_Data.py via Streamlit's AppTest tegen de offline stand-in
+# (benchmarks/standin_server.py), dus zonder netwerk. Per scenario:
+#   koud  = eerste run na het legen van alle caches (inclusief upstream-latentie)
+#   warm  = mediaan en p90 van de reruns daarna
+#
+# Gebruik (vanuit de root van de repo):
+#   python benchmarks/rerun_latentie.py
+#   python benchmarks/rerun_latentie.py --reruns 20 --latentie 0.3 --fouten 0.1
+#   python benchmarks/rerun_latentie.py --json resultaten.json   # om runs te vergelijken
+#   WEER_GRID=1 python benchmarks/rerun_latentie.py               # met het Nederland-rooster
+
+import argparse
+import json
+import locale
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# ---------------------------------------- End
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = ROOT / "Case2_KNMI_Data.py"
+ZOEKTERM = "Amsterdam"
+
+VISUALISATIES = ["Huidig weer", "Uurverwachting", "10-daagse voorspelling", "Visualisatie 24h voorspelling"]
+
+# (naam, pagina, gekozen visualisaties, extra widgetinstellingen)
+SCENARIOS = [
+    ("alleen kaart", "Het Weer", [], {}),
+    ("huidig weer", "Het Weer", ["Huidig weer"], {}),
+    ("uurverwachting 24u", "Het Weer", ["Uurverwachting"], {}),
+    ("uurverwachting 48u", "Het Weer", ["Uurverwachting"], {"uren": "Weersverwachtingen 48 uur"}),
+    ("10-daagse", "Het Weer", ["10-daagse voorspelling"], {}),
+    ("figuur 2 temp", "Het Weer", ["Visualisatie 24h voorspelling"], {}),
+    ("figuur 2 alles", "Het Weer", ["Visualisatie 24h voorspelling"], {"fig2": (True, True, True)}),
+    ("figuur 2 modellen", "Het Weer", ["Visualisatie 24h voorspelling"], {"fig2": (True, True, True, True)}),
+    ("figuur 2 dataframe", "Het Weer", ["Visualisatie 24h voorspelling"], {"fig2_optie": "Dataframe"}),
+    ("alle visualisaties", "Het Weer", VISUALISATIES, {"fig2": (True, True, True)}),
+    ("back-end data", "Back-end Data", [], {}),
+]
+
+
+# -----------------------
+# Functies
+# -----------------------
+def _zet_omgeving(url):
+    # Moet vóór het importeren van de app-modules gebeuren
+    os.environ["OPEN_METEO_URL"] = f"{url}/v1/forecast"
+    os.environ["NOMINATIM_URL"] = f"{url}/search"
+    os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+    sys.path.insert(0, str(ROOT))
+
+    # Niet elke machine heeft de nl_NL-locale; voor de meting maakt dat niet uit
+    echte_setlocale = locale.setlocale
+    def setlocale(categorie, naam=None):
+        try:
+            return echte_setlocale(categorie, naam)
+        except locale.Error:
+            return echte_setlocale(categorie)
+    locale.setlocale = setlocale
+
+    import geocode
+    geocode.CACHE_PAD = Path(tempfile.mkdtemp()) / "geocode.sqlite"
+    geocode.NOMINATIM_INTERVAL = 0
+
+def _kies_pagina(pagina):
+    # streamlit_option_menu is een custom component die AppTest niet kan bedienen
+    import streamlit_option_menu
+    streamlit_option_menu.option_menu = lambda *args, **kwargs: pagina
+
+def _leeg_caches():
+    import streamlit as st
+    from weercache import verwachtingen_cache
+    from weergrid import kubus_cache
+    from ensemble import ensemble_cache
+
+    st.cache_data.clear()
+    verwachtingen_cache.leeg()
+    kubus_cache.leeg()
+    ensemble_cache.leeg()
+
+def _stel_in(at, gekozen, extra):
+    at.text_input[0].input(ZOEKTERM).run()
+    if gekozen:
+        at.multiselect[0].set_value(gekozen).run()
+    if "uren" in extra:
+        next(r for r in at.radio if "Weersverwachtingen 24 uur" in r.options).set_value(extra["uren"]).run()
+    if "fig2_optie" in extra:
+        next(r for r in at.radio if "Dataframe" in r.options).set_value(extra["fig2_optie"]).run()
+    if "fig2" in extra:
+        for checkbox, waarde in zip(at.checkbox, extra["fig2"]):
+            checkbox.set_value(waarde)
+        at.run()
+
+def meet_scenario(naam, pagina, gekozen, extra, reruns):
+    from streamlit.testing.v1 import AppTest
+
+    _kies_pagina(pagina)
+    at = AppTest.from_file(str(SCRIPT), default_timeout=120)
+    at.run()
+    _stel_in(at, gekozen, extra)
+    if at.exception:
+        raise RuntimeError(f"{naam}: {at.exception[0].message}")
+
+    _leeg_caches()
+    start = time.perf_counter()
+    at.run()
+    koud = time.perf_counter() - start
+
+    warm = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        warm.append(time.perf_counter() - start)
+    warm.sort()
+    return {
+        "scenario": naam,
+        "koud_ms": koud * 1000,
+        "warm_mediaan_ms": statistics.median(warm) * 1000,
+        "warm_p90_ms": warm[math.ceil(0.9 * len(warm)) - 1] * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Reruntijd van Case2_KNMI_Data.py zonder netwerk")
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("--latentie", type=float, default=0.1, help="upstream-latentie van de stand-in in seconden")
+    parser.add_argument("--fouten", type=float, default=0.0, help="fractie upstream-requests die een 500 krijgt")
+    parser.add_argument("--json", help="schrijf de resultaten ook naar dit bestand")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from standin_server import start_server
+
+    server, url = start_server(latentie=args.latentie, fouten=args.fouten)
+    _zet_omgeving(url)
+
+    print(f"Stand-in: {url}  latentie {args.latentie*1000:.0f} ms, fouten {args.fouten:.0%}, {args.reruns} reruns\n")
+    print(f"{'scenario':<24}{'koud (ms)':>12}{'warm p50':>12}{'warm p90':>12}")
+    resultaten = []
+    for scenario in SCENARIOS:
+        r = meet_scenario(*scenario, reruns=args.reruns)
+        resultaten.append(r)
+        print(f"{r['scenario']:<24}{r['koud_ms']:>12.1f}{r['warm_mediaan_ms']:>12.1f}{r['warm_p90_ms']:>12.1f}")
+
+    server.shutdown()
+    if args.json:
+        Path(args.json).write_text(json.dumps(resultaten, indent=2))
+
+
+if __name__ == "__main__":
+    main()
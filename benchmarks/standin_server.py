@@ -0,0 +1,353 @@
+# -------------------------------------------------- #
+# Offline stand-in voor Open-Meteo en Nominatim      #
+# -------------------------------------------------- #
+#
+# Een lokale HTTP-server die de antwoorden van de echte diensten naspeelt, zodat
+# de apps en benchmarks zonder netwerk draaien. Voor elke request geldt:
+#   1. staat er een opname in benchmarks/opnames/ (.bin voor FlatBuffers, .json
+#      voor JSON), dan wordt die teruggegeven;
+#   2. anders wordt een synthetische (maar realistisch gevormde) response gemaakt.
+# Er worden geen opnames meegeleverd; zonder --opnemen draait alles synthetisch.
+# Open-Meteo-responses komen als FlatBuffers (format=flatbuffers, zoals
+# openmeteo_requests ze vraagt) of als JSON (zoals app.py ze vraagt).
+#
+# Gebruik:
+#   python benchmarks/standin_server.py --poort 8765 --latentie 0.2 --fouten 0.05
+#   OPEN_METEO_URL=http://127.0.0.1:8765/v1/forecast \
+#   NOMINATIM_URL=http://127.0.0.1:8765/search streamlit run Case2_KNMI_Data.py
+#
+# Opnames maken (met netwerk):
+#   python benchmarks/standin_server.py --opnemen Amsterdam Utrecht
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+from zoneinfo import ZoneInfo
+
+import flatbuffers
+import numpy as np
+
+# ---------------------------------------- End
+
+OPNAMES = Path(__file__).resolve().parent / "opnames"
+
+# Open-Meteo FlatBuffers-schema: slotnummers van de velden die de apps lezen
+RESP_LATITUDE, RESP_LONGITUDE, RESP_ELEVATION, RESP_GENERATION_TIME, RESP_MODEL = 0, 1, 2, 3, 5
+RESP_UTC_OFFSET, RESP_TIMEZONE, RESP_DAILY, RESP_HOURLY = 6, 7, 10, 11
+VWT_TIME, VWT_TIME_END, VWT_INTERVAL, VWT_VARIABLES = 0, 1, 2, 3
+VWV_VALUES, VWV_VALUES_INT64 = 3, 4
+
+# De JSON-request van app.haal_open_meteo, voor het opnemen van JSON-responses
+APP_JSON_PARAMS = {
+    "daily": "temperature_2m_max,temperature_2m_min,weather_code,sunrise,sunset",
+    "hourly": "temperature_2m,rain,weather_code,wind_speed_10m,wind_direction_10m",
+    "models": "knmi_seamless",
+    "timezone": "Europe/Berlin",
+    "forecast_days": 10,
+}
+
+# Variabelen die als unix-timestamps (int64) terugkomen
+INT64_VARS = {"sunrise", "sunset"}
+
+
+# -----------------------
+# Request-parameters
+# -----------------------
+def _lijst(params, naam):
+    # Open-Meteo accepteert zowel "a,b" als herhaalde parameters (a&a)
+    waarden = []
+    for sleutel, waarde in params:
+        if sleutel == naam:
+            waarden += [w for w in waarde.split(",") if w]
+    return waarden
+
+def _waarde(params, naam, standaard=None):
+    waarden = _lijst(params, naam)
+    return waarden[0] if waarden else standaard
+
+def _offset(tz_naam):
+    if not tz_naam or tz_naam.upper() in ("GMT", "UTC"):
+        return 0, "GMT"
+    tz = ZoneInfo("Europe/Amsterdam" if tz_naam == "auto" else tz_naam)
+    return int(datetime.now(tz).utcoffset().total_seconds()), tz.key
+
+def opname_sleutel(params):
+    # Eén locatie, parameters gesorteerd, zonder 'format'. "a,b" en a&b geven dezelfde sleutel.
+    schoon = sorted((k, w) for k, v in params if k != "format" for w in v.split(","))
+    return hashlib.sha1(urlencode(schoon).encode()).hexdigest()[:16]
+
+
+# -----------------------
+# Synthetische verwachting
+# -----------------------
+def synthetische_reeksen(lat, lon, namen, tijden, dagelijks, variant=0):
+    # Deterministisch per locatie (en per model), met een dagelijkse gang in temperatuur
+    rng = np.random.default_rng(int(abs(lat) * 1000) * 100003 + int(abs(lon) * 1000) + variant * 7919)
+    n = len(tijden)
+    uur = (tijden // 3600) % 24
+    reeksen = {}
+    for naam in namen:
+        if naam in INT64_VARS:
+            uur_van_de_dag = 7 if naam == "sunrise" else 19
+            reeksen[naam] = tijden + uur_van_de_dag * 3600 + rng.integers(0, 1800, n)
+        elif "temperature" in naam:
+            basis = 12 + 6 * np.sin((uur - 9) / 24 * 2 * np.pi) if not dagelijks else 12
+            extra = 4 if naam.endswith("max") else (-4 if naam.endswith("min") else 0)
+            reeksen[naam] = basis + extra + rng.normal(0, 1.5, n)
+        elif naam in ("rain", "precipitation", "precipitation_sum", "showers"):
+            natte = rng.random(n) < (0.5 if dagelijks else 0.15)
+            reeksen[naam] = np.round(np.where(natte, rng.exponential(4 if dagelijks else 0.8, n), 0), 1)
+        elif naam == "weather_code":
+            reeksen[naam] = rng.choice([0, 1, 2, 3, 45, 61, 63, 80, 95], n, p=[.2, .15, .15, .2, .05, .1, .05, .08, .02])
+        elif "wind_speed" in naam:
+            reeksen[naam] = np.abs(rng.normal(18, 8, n))
+        elif "wind_direction" in naam:
+            reeksen[naam] = rng.uniform(0, 360, n)
+        else:
+            reeksen[naam] = np.zeros(n)
+    return reeksen
+
+def _tijdas(offset, start, dagen, stap):
+    start = (start + offset) // 86400 * 86400 - offset
+    return np.arange(start, start + dagen * 86400, stap, dtype=np.int64)
+
+def synthetische_locatie(params, lat, lon, model=None, variant=0):
+    offset, tz = _offset(_waarde(params, "timezone"))
+    if _waarde(params, "start_date"):
+        # Archief-API: vaste periode in plaats van forecast_days vanaf vandaag
+        begin = int(datetime.fromisoformat(_waarde(params, "start_date")).replace(tzinfo=timezone.utc).timestamp())
+        eind = int(datetime.fromisoformat(_waarde(params, "end_date")).replace(tzinfo=timezone.utc).timestamp())
+        dagen = (eind - begin) // 86400 + 1
+    else:
+        begin, dagen = int(time.time()), int(_waarde(params, "forecast_days", 7))
+    blokken = {}
+    for blok, stap in (("daily", 86400), ("hourly", 3600)):
+        namen = _lijst(params, blok)
+        if namen:
+            tijden = _tijdas(offset, begin, dagen, stap)
+            blokken[blok] = (tijden, stap, namen, synthetische_reeksen(lat, lon, namen, tijden, blok == "daily", variant))
+    return {"latitude": lat, "longitude": lon, "elevation": 1.0, "model": model,
+            "utc_offset_seconds": offset, "timezone": tz, "blokken": blokken}
+
+
+# -----------------------
+# FlatBuffers en JSON
+# -----------------------
+def _bouw_blok(builder, tijden, stap, namen, reeksen):
+    variabelen = []
+    for naam in namen:
+        if naam in INT64_VARS:
+            vector = builder.CreateNumpyVector(np.asarray(reeksen[naam], dtype=np.int64))
+            slot = VWV_VALUES_INT64
+        else:
+            vector = builder.CreateNumpyVector(np.asarray(reeksen[naam], dtype=np.float32))
+            slot = VWV_VALUES
+        builder.StartObject(15)
+        builder.PrependUOffsetTRelativeSlot(slot, vector, 0)
+        variabelen.append(builder.EndObject())
+
+    builder.StartVector(4, len(variabelen), 4)
+    for var in reversed(variabelen):
+        builder.PrependUOffsetTRelative(var)
+    vector = builder.EndVector()
+
+    builder.StartObject(4)
+    builder.PrependInt64Slot(VWT_TIME, int(tijden[0]), 0)
+    builder.PrependInt64Slot(VWT_TIME_END, int(tijden[-1]) + stap, 0)
+    builder.PrependInt32Slot(VWT_INTERVAL, stap, 0)
+    builder.PrependUOffsetTRelativeSlot(VWT_VARIABLES, vector, 0)
+    return builder.EndObject()
+
+def naar_flatbuffer(locatie):
+    # Eén bericht, met de lengte (4 bytes little-endian) ervoor, zoals Open-Meteo streamt
+    builder = flatbuffers.Builder(4096)
+    blokken = {blok: _bouw_blok(builder, *args) for blok, args in locatie["blokken"].items()}
+    tz = builder.CreateString(locatie["timezone"])
+
+    builder.StartObject(16)
+    builder.PrependFloat32Slot(RESP_LATITUDE, locatie["latitude"], 0.0)
+    builder.PrependFloat32Slot(RESP_LONGITUDE, locatie["longitude"], 0.0)
+    builder.PrependFloat32Slot(RESP_ELEVATION, locatie["elevation"], 0.0)
+    builder.PrependFloat32Slot(RESP_GENERATION_TIME, 0.1, 0.0)
+    builder.PrependInt32Slot(RESP_UTC_OFFSET, locatie["utc_offset_seconds"], 0)
+    if locatie.get("model"):
+        from openmeteo_sdk.Model import Model
+        builder.PrependUint8Slot(RESP_MODEL, getattr(Model, locatie["model"], 0), 0)
+    builder.PrependUOffsetTRelativeSlot(RESP_TIMEZONE, tz, 0)
+    if "daily" in blokken:
+        builder.PrependUOffsetTRelativeSlot(RESP_DAILY, blokken["daily"], 0)
+    if "hourly" in blokken:
+        builder.PrependUOffsetTRelativeSlot(RESP_HOURLY, blokken["hourly"], 0)
+    builder.Finish(builder.EndObject())
+    bericht = bytes(builder.Output())
+    return len(bericht).to_bytes(4, "little") + bericht
+
+def naar_json(locatie):
+    offset = locatie["utc_offset_seconds"]
+
+    def iso(ts):
+        return datetime.fromtimestamp(int(ts) + offset, timezone.utc).strftime("%Y-%m-%dT%H:%M")
+
+    data = {k: locatie[k] for k in ("latitude", "longitude", "elevation", "utc_offset_seconds", "timezone")}
+    for blok, (tijden, _, namen, reeksen) in locatie["blokken"].items():
+        data[blok] = {"time": [iso(t) if blok == "hourly" else iso(t)[:10] for t in tijden]}
+        for naam in namen:
+            if naam in INT64_VARS:
+                data[blok][naam] = [iso(t) for t in reeksen[naam]]
+            else:
+                data[blok][naam] = [round(float(v), 1) for v in reeksen[naam]]
+    return data
+
+
+# -----------------------
+# Nominatim
+# -----------------------
+def synthetische_plaatsen(query, limit=5):
+    # Een paar kandidaten binnen Nederland, vast per zoekterm
+    rng = random.Random(query.casefold())
+    aantal = min(limit, 3)
+    return [{
+        "display_name": f"{query.title()}{'' if i == 0 else f' ({i + 1})'}, Nederland",
+        "lat": f"{rng.uniform(51.3, 53.3):.5f}", "lon": f"{rng.uniform(3.6, 7.0):.5f}",
+    } for i in range(aantal)]
+
+
+# -----------------------
+# Server
+# -----------------------
+class StandInHandler(BaseHTTPRequestHandler):
+    latentie = 0.0
+    fouten = 0.0
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _stuur(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.latentie:
+            time.sleep(self.latentie)
+        if self.fouten and random.random() < self.fouten:
+            return self._stuur(500, b'{"error": true, "reason": "stand-in: geinjecteerde fout"}', "application/json")
+
+        url = urlsplit(self.path)
+        params = parse_qsl(url.query, keep_blank_values=True)
+        if url.path.endswith("/search"):
+            return self._nominatim(params)
+        if url.path.startswith("/v1/"):
+            return self._open_meteo(params)
+        self._stuur(404, b"{}", "application/json")
+
+    def _nominatim(self, params):
+        query = _waarde(params, "q", "")
+        opname = OPNAMES / f"nominatim_{hashlib.sha1(query.casefold().encode()).hexdigest()[:16]}.json"
+        if opname.exists():
+            body = opname.read_bytes()
+        else:
+            body = json.dumps(synthetische_plaatsen(query, int(_waarde(params, "limit", 5)))).encode()
+        self._stuur(200, body, "application/json")
+
+    def _open_meteo(self, params):
+        lats = [float(x) for x in _lijst(params, "latitude")]
+        lons = [float(x) for x in _lijst(params, "longitude")]
+        overig = [(k, v) for k, v in params if k not in ("latitude", "longitude")]
+        flatbuffers_gevraagd = _waarde(params, "format") == "flatbuffers"
+
+        # Met meerdere modellen komt er per locatie één bericht per model, in de gevraagde volgorde
+        modellen = _lijst(params, "models")
+        berichten = []
+        for lat, lon in zip(lats, lons):
+            eigen = [("latitude", str(lat)), ("longitude", str(lon))] + overig
+            opname = OPNAMES / f"forecast_{opname_sleutel(eigen)}{'.bin' if flatbuffers_gevraagd else '.json'}"
+            if opname.exists():
+                berichten.append(opname.read_bytes() if flatbuffers_gevraagd else json.loads(opname.read_bytes()))
+            elif len(modellen) > 1:
+                berichten += [synthetische_locatie(eigen, lat, lon, model, i) for i, model in enumerate(modellen)]
+            else:
+                berichten.append(synthetische_locatie(eigen, lat, lon))
+
+        if flatbuffers_gevraagd:
+            body = b"".join(b if isinstance(b, bytes) else naar_flatbuffer(b) for b in berichten)
+            return self._stuur(200, body, "application/octet-stream")
+        data = [b if "blokken" not in b else naar_json(b) for b in berichten]
+        self._stuur(200, json.dumps(data[0] if len(data) == 1 else data).encode(), "application/json")
+
+def start_server(poort=0, latentie=0.0, fouten=0.0):
+    # Start de server in een achtergrondthread; geeft (server, basis-URL) terug
+    handler = type("Handler", (StandInHandler,), {"latentie": latentie, "fouten": fouten})
+    server = ThreadingHTTPServer(("127.0.0.1", poort), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+# -----------------------
+# Opnemen
+# -----------------------
+def neem_op(zoektermen):
+    import requests
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from weercache import snap
+    from weerdata import verwachting_params
+
+    OPNAMES.mkdir(exist_ok=True)
+    for query in zoektermen:
+        resp = requests.get("https://nominatim.openstreetmap.org/search",
+                            params={"q": query, "format": "json", "limit": 5, "addressdetails": 1},
+                            headers={"User-Agent": "streamlit-app"}, timeout=10)
+        resp.raise_for_status()
+        sleutel = hashlib.sha1(query.casefold().encode()).hexdigest()[:16]
+        (OPNAMES / f"nominatim_{sleutel}.json").write_bytes(resp.content)
+
+        for plaats in resp.json():
+            params = verwachting_params(snap(float(plaats["lat"])), snap(float(plaats["lon"])))
+            eigen = [(k, str(w)) for k, v in params.items() for w in (v if isinstance(v, list) else [v])]
+            forecast = requests.get("https://api.open-meteo.com/v1/forecast",
+                                    params=eigen + [("format", "flatbuffers")], timeout=30)
+            forecast.raise_for_status()
+            (OPNAMES / f"forecast_{opname_sleutel(eigen)}.bin").write_bytes(forecast.content)
+
+            # app.py vraagt JSON, met de coördinaten zoals Nominatim ze gaf
+            eigen = [("latitude", str(float(plaats["lat"]))), ("longitude", str(float(plaats["lon"])))]
+            eigen += [(k, str(v)) for k, v in APP_JSON_PARAMS.items()]
+            forecast = requests.get("https://api.open-meteo.com/v1/forecast", params=eigen, timeout=30)
+            forecast.raise_for_status()
+            (OPNAMES / f"forecast_{opname_sleutel(eigen)}.json").write_bytes(forecast.content)
+            time.sleep(1)  # Nominatim: max. één request per seconde
+        print(f"Opgenomen: {query}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline stand-in voor Open-Meteo en Nominatim")
+    parser.add_argument("--poort", type=int, default=8765)
+    parser.add_argument("--latentie", type=float, default=0.0, help="extra vertraging per request in seconden")
+    parser.add_argument("--fouten", type=float, default=0.0, help="fractie requests die een 500 krijgt")
+    parser.add_argument("--opnemen", nargs="+", metavar="ZOEKTERM", help="neem echte responses op en stop")
+    args = parser.parse_args()
+
+    if args.opnemen:
+        neem_op(args.opnemen)
+    else:
+        server, url = start_server(args.poort, args.latentie, args.fouten)
+        print(f"Stand-in draait op {url}  (Ctrl+C om te stoppen)")
+        print(f"  OPEN_METEO_URL={url}/v1/forecast")
+        print(f"  NOMINATIM_URL={url}/search")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
@@ -0,0 +1,127 @@
+# ---------------------------------------------------- #
+# Meerdere modellen vergelijken: één request, één kubus #
+# ---------------------------------------------------- #
+#
+# Alle gekozen modellen (KNMI, ECMWF, ICON, GFS) komen in één Open-Meteo-request
+# mee. De FlatBuffers-responses gaan rechtstreeks in één float32-array van
+# (model x tijd x variabele); gemiddelde, spreiding en overschrijdingskansen
+# zijn daarna NumPy-reducties over de modelas, zonder DataFrame per model.
+
+import numpy as np
+import pandas as pd
+
+from weercache import WeerCache
+from weerdata import TIJDZONE, uur_index, weather_api
+
+# ---------------------------------------- End
+
+MODELLEN = {
+    "knmi_seamless": "KNMI",
+    "ecmwf_ifs025": "ECMWF",
+    "icon_seamless": "ICON",
+    "gfs_seamless": "GFS",
+}
+
+# Alleen variabelen die je kunt middelen; weercode en windrichting niet
+ENSEMBLE_VARS = ["temperature_2m", "rain", "wind_speed_10m"]
+
+# Drempels voor de overschrijdingskansen, per variabele
+DREMPELS = {
+    "temperature_2m": [0.0, 25.0],
+    "rain": [0.1, 1.0],
+    "wind_speed_10m": [50.0, 75.0],
+}
+
+# (roosterpunt, modellen) -> kubus; verloopt net als de verwachtingen bij de volgende modelrun
+ensemble_cache = WeerCache(max_items=256, naam="ensemble")
+
+
+# -----------------------
+# Ophalen en decoderen
+# -----------------------
+def ensemble_params(lat, lon, modellen):
+    return {
+        "latitude": lat, "longitude": lon,
+        "hourly": ENSEMBLE_VARS,
+        "models": list(modellen),
+        "timezone": TIJDZONE,
+        "forecast_days": 10
+    }
+
+def lees_ensemble(responses, modellen):
+    # Eén response per model -> {"time_utc": (tijd,), "waarden": (model, tijd, variabele)}.
+    # Modellen met een kortere horizon houden NaN aan het eind.
+    from openmeteo_sdk.Model import Model
+
+    positie = {getattr(Model, naam): i for i, naam in enumerate(modellen)}
+    blokken = [r.Hourly() for r in responses]
+    begin = min(b.Time() for b in blokken)
+    eind = max(b.TimeEnd() for b in blokken)
+    stap = blokken[0].Interval()
+    time_utc = np.arange(begin, eind, stap, dtype=np.int64)
+
+    waarden = np.full((len(modellen), len(time_utc), len(ENSEMBLE_VARS)), np.nan, dtype=np.float32)
+    for volgorde, (response, blok) in enumerate(zip(responses, blokken)):
+        # Open-Meteo zet het model in de response; anders geldt de gevraagde volgorde
+        m = positie.get(response.Model(), volgorde)
+        start = (blok.Time() - begin) // stap
+        for v in range(len(ENSEMBLE_VARS)):
+            reeks = blok.Variables(v).ValuesAsNumpy()
+            waarden[m, start:start + len(reeks), v] = reeks
+    return {"modellen": list(modellen), "time_utc": time_utc, "waarden": waarden}
+
+def _download_ensemble(lat, lon, modellen):
+    responses = weather_api(ensemble_params(lat, lon, modellen))
+    if not responses or len(responses) != len(modellen):
+        return {}
+    return lees_ensemble(responses, modellen)
+
+def haal_ensemble(lat, lon, modellen=tuple(MODELLEN)):
+    modellen = tuple(modellen)
+    sleutel = ensemble_cache.sleutel(lat, lon, modellen)
+    return ensemble_cache.haal(sleutel, lambda: _download_ensemble(sleutel[0], sleutel[1], modellen))
+
+
+# -----------------------
+# Statistiek
+# -----------------------
+def ensemble_statistiek(waarden, drempels=DREMPELS):
+    # Reducties over de modelas (as 0). NaN (model zonder data voor dat uur)
+    # telt niet mee; een uur zonder enkel model wordt NaN.
+    geldig = ~np.isnan(waarden)
+    aantal = geldig.sum(axis=0)
+    nul = np.where(geldig, waarden, 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        gemiddelde = nul.sum(axis=0) / aantal
+        spreiding = np.sqrt((np.where(geldig, waarden - gemiddelde, 0) ** 2).sum(axis=0) / aantal)
+        kansen = {}
+        for v, naam in enumerate(ENSEMBLE_VARS):
+            drempel_lijst = [float(d) for d in drempels.get(naam, [])]
+            grenzen = np.asarray(drempel_lijst, dtype=np.float32)
+            # (drempel, model, tijd) in één vergelijking
+            boven = (waarden[None, :, :, v] > grenzen[:, None, None]).sum(axis=1)
+            # Sleutels van de opgegeven drempels zelf, niet van de float32-versie (0.1 blijft 0.1)
+            for grens, rij in zip(drempel_lijst, boven):
+                kansen[(naam, grens)] = (rij / aantal[:, v]).astype(np.float32)
+    return {
+        "aantal": aantal,
+        "gemiddelde": gemiddelde.astype(np.float32),
+        "spreiding": spreiding.astype(np.float32),
+        "min": np.where(aantal > 0, np.where(geldig, waarden, np.inf).min(axis=0), np.nan).astype(np.float32),
+        "max": np.where(aantal > 0, np.where(geldig, waarden, -np.inf).max(axis=0), np.nan).astype(np.float32),
+        "kansen": kansen,
+    }
+
+def ensemble_dataframe(ensemble, drempels=DREMPELS):
+    # Per uur: gemiddelde, min, max en spreiding per variabele, plus de kansen.
+    # Zelfde tz-aware index en "Local Time"-kolom als maak_fig2_dataframes; afgerond
+    # zoals maak_dataframes (1 decimaal, kansen op 2) en in float64 voor het tonen.
+    stat = ensemble_statistiek(ensemble["waarden"], drempels)
+    index = uur_index(ensemble)
+    kolommen = {"Local Time": index.tz_localize(None)}
+    for v, naam in enumerate(ENSEMBLE_VARS):
+        for maat in ("gemiddelde", "min", "max", "spreiding"):
+            kolommen[f"{naam} {maat}"] = np.round(stat[maat][:, v].astype(np.float64), 1)
+    for (naam, grens), kans in stat["kansen"].items():
+        kolommen[f"P({naam} > {grens:g})"] = np.round(kans.astype(np.float64), 2)
+    return pd.DataFrame(kolommen, index=index)
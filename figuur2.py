@@ -0,0 +1,175 @@
+# ------------------------------------------------ #
+# Figuur 2: 24h weersvoorspelling (Temp, Regen, Wind) #
+# ------------------------------------------------ #
+
+import plotly.graph_objects as go
+
+# ---------------------------------------- End
+
+
+# -----------------------
+# Functies
+# -----------------------
+def cursor(row, show_temp, show_rain, show_wind):
+    # Verticale lijn + annotatiebox voor één uur. Dit is het enige deel van de
+    # figuur dat verandert als je een ander uur kiest.
+    lijn = dict(
+        type="line", xref="x", yref="y domain",
+        x0=row["Local Time"], x1=row["Local Time"], y0=0, y1=1,
+        line=dict(width=2, dash="dash", color="grey")
+    )
+
+    # Annotatie box met informatie over de geselecteerde tijd
+    info_text = f"<b>{row['Local Time'].strftime('%H:%M')}</b><br>"
+    if show_temp:
+        info_text += f"🌡️ Temp: {row['temperature_2m']:.1f} °C<br>"
+    if show_rain:
+        info_text += f"🌧️ Rain: {row['rain']:.1f} mm<br>"
+    if show_wind:
+        info_text += f"💨 Wind: {row['wind_speed_10m']:.0f} km/h"
+
+    annotatie = dict(
+        x=row["Local Time"],
+        y=max(
+            row["temperature_2m"] if show_temp else 0,
+            row["rain"] if show_rain else 0,
+            row["wind_speed_10m"] if show_wind else 0
+        ) + 5,
+        text=info_text,
+        showarrow=False,
+        align="left",
+        bgcolor="rgba(255,255,255,0.8)",
+        bordercolor="black"
+    )
+    return lijn, annotatie
+
+def modelband(fig2, band, naam, label, kleur, yaxis):
+    # Min-max van de modellen als gevulde band, met het modelgemiddelde gestippeld.
+    # De ondergrens is een onzichtbare lijn waar de bovengrens naartoe vult.
+    fig2.add_trace(go.Scatter(
+        x=band["Local Time"], y=band[f"{naam} min"],
+        mode='lines', line=dict(width=0), showlegend=False, yaxis=yaxis
+    ))
+    fig2.add_trace(go.Scatter(
+        x=band["Local Time"], y=band[f"{naam} max"],
+        mode='lines', line=dict(width=0), fill='tonexty', fillcolor=kleur,
+        name=f"{label}: modellen (min-max)", yaxis=yaxis
+    ))
+    fig2.add_trace(go.Scatter(
+        x=band["Local Time"], y=band[f"{naam} gemiddelde"],
+        mode='lines', line=dict(color='grey', dash='dot'),
+        name=f"{label}: modelgemiddelde", yaxis=yaxis
+    ))
+
+def _bovengrens(future_hours, band, naam):
+    if band is None:
+        return future_hours[naam].max()
+    return max(future_hours[naam].max(), band[f"{naam} max"].max())
+
+def bouw_fig2(future_hours, show_temp, show_rain, show_wind, band=None):
+    # Basisfiguur (traces en assen) plus een Plotly-slider met één stap per uur.
+    # Elke stap doet alleen een 'relayout' van de cursor in de browser, dus het
+    # kiezen van een uur kost geen rerun van het Streamlit-script.
+    # band: optioneel de modelvergelijking (ensemble.ensemble_dataframe) voor dezelfde uren.
+    fig2 = go.Figure()
+
+    if band is not None:
+        if show_temp:
+            modelband(fig2, band, "temperature_2m", "Temp", 'rgba(230, 93, 32, 0.25)', "y1")
+        if show_rain:
+            modelband(fig2, band, "rain", "Regen", 'rgba(67, 147, 219, 0.25)', "y2")
+        if show_wind:
+            modelband(fig2, band, "wind_speed_10m", "Wind", 'rgba(155, 52, 201, 0.25)', "y3")
+
+    if show_temp:
+        fig2.add_trace(go.Scatter(
+            x=future_hours["Local Time"],
+            y=future_hours["temperature_2m"],
+            mode='lines+markers',
+            line=dict(color='rgba(230, 93, 32, 0.761)'),
+            fill='tozeroy',
+            fillcolor='rgba(201, 90, 41, 0.49)',
+            name="Temperature (°C)",
+            yaxis="y1"
+        ))
+
+    if show_rain:
+        fig2.add_trace(go.Scatter(
+            x=future_hours["Local Time"],
+            y=future_hours["rain"],
+            mode='lines+markers',
+            line=dict(color='rgba(67, 147, 219, 0.5)'),
+            fill='tozeroy',
+            fillcolor='rgba(134, 61, 153, 0.2)',
+            name="Regen (mm)",
+            yaxis="y2"
+        ))
+
+    if show_wind:
+        fig2.add_trace(go.Scatter(
+            x=future_hours["Local Time"],
+            y=future_hours["wind_speed_10m"],
+            mode='lines+markers',
+            line=dict(color='rgba(155, 52, 201, 0.5)'),
+            fill='tozeroy',
+            fillcolor='rgba(154, 66, 194, 0.2)',
+            name="Wind Snelheid (km/h)",
+            yaxis="y3"
+        ))
+
+    fig2.update_layout(
+        title="Weersvoorspelling 24h",
+        xaxis_title="Lokale Tijd",
+        xaxis=dict(domain=[0.0, 0.85]),
+        yaxis=dict(title="Temperatuur (°C)", range=[0, _bovengrens(future_hours, band, "temperature_2m")+20]),
+        yaxis2=dict(title="Regen (mm)", side='right', overlaying='y', range=[0, _bovengrens(future_hours, band, "rain")+2]),
+        yaxis3=dict(title="Wind Snelheid (km/h)", side='right', overlaying='y', position=0.98, range=[0, _bovengrens(future_hours, band, "wind_speed_10m")+15]),
+        hovermode=False,  # Disable hover because slider controls info
+    )
+
+    if show_temp == False:
+        if show_wind == False:
+            fig2.update_layout(yaxis2=dict(showgrid=True))
+        elif (show_rain and show_wind) == True:
+            fig2.update_layout(yaxis2=dict(showgrid=True))
+            fig2.update_layout(yaxis3=dict(showgrid=False))
+        else:
+            fig2.update_layout(yaxis3=dict(showgrid=True, position=0.87))
+    else:
+        fig2.update_layout(yaxis1=dict(showgrid=True))
+        fig2.update_layout(yaxis2=dict(showgrid=False))
+        fig2.update_layout(yaxis3=dict(showgrid=False))
+
+    fig2.update_xaxes(
+        showspikes=True,
+        spikecolor="grey",
+        spikemode="across",
+        spikesnap="data",
+        spikethickness=2,
+        spikedash='solid'
+    )
+
+    if future_hours.empty:
+        return fig2
+
+    # Eén slider-stap per uur; stap 0 is de begintoestand
+    stappen = []
+    for _, row in future_hours.iterrows():
+        lijn, annotatie = cursor(row, show_temp, show_rain, show_wind)
+        stappen.append(dict(
+            method="relayout",
+            label=row["Local Time"].strftime("%H:%M"),
+            args=[{"shapes": [lijn], "annotations": [annotatie]}]
+        ))
+
+    fig2.update_layout(
+        shapes=stappen[0]["args"][0]["shapes"],
+        annotations=stappen[0]["args"][0]["annotations"],
+        sliders=[dict(
+            active=0,
+            currentvalue=dict(prefix="Geselecteerd uur: "),
+            pad=dict(t=50),
+            steps=stappen
+        )]
+    )
+    return fig2
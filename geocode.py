@@ -0,0 +1,155 @@
+# ---------------------------------------------------- #
+# Plaatsen zoeken: lokaal eerst, Nominatim als laatste #
+# ---------------------------------------------------- #
+
+import bisect
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+
+from meting import tel
+
+# ---------------------------------------- End
+
+MAP = Path(__file__).resolve().parent
+CACHE_PAD = MAP / ".cache_geocode.sqlite"
+
+# Optionele offline gazetteer: de GeoNames-dump voor Nederland (NL.txt, tab-gescheiden),
+# te downloaden via https://download.geonames.org/export/dump/NL.zip
+GAZETTEER_PAD = Path(os.environ.get("GAZETTEER_PAD", MAP / "data" / "NL.txt"))
+
+NOMINATIM_URL = os.environ.get("NOMINATIM_URL", "https://nominatim.openstreetmap.org/search")
+# Nominatim staat maximaal één request per seconde toe
+NOMINATIM_INTERVAL = 1.0
+MAX_RESULTATEN = 5
+
+# GeoNames admin1-codes voor de Nederlandse provincies
+PROVINCIES = {
+    "01": "Drenthe", "02": "Friesland", "03": "Gelderland", "04": "Groningen",
+    "05": "Limburg", "06": "Noord-Brabant", "07": "Noord-Holland", "09": "Utrecht",
+    "10": "Zeeland", "11": "Zuid-Holland", "15": "Overijssel", "16": "Flevoland",
+}
+
+_nominatim_lock = threading.Lock()
+_laatste_nominatim = 0.0
+_gazetteer = None
+
+
+# -----------------------
+# Functies
+# -----------------------
+def normaliseer(query):
+    # "  's-Hertogenbosch " en "'s-hertogenbosch" krijgen dezelfde sleutel; accenten vallen weg
+    tekst = unicodedata.normalize("NFKD", query or "")
+    tekst = "".join(c for c in tekst if not unicodedata.combining(c))
+    return " ".join(tekst.casefold().split())
+
+# --- Persistente cache ---
+def _cache():
+    db = sqlite3.connect(CACHE_PAD, timeout=5)
+    db.execute("CREATE TABLE IF NOT EXISTS geocode (query TEXT PRIMARY KEY, resultaten TEXT, tijd REAL)")
+    return db
+
+def uit_cache(sleutel):
+    db = _cache()
+    try:
+        rij = db.execute("SELECT resultaten FROM geocode WHERE query = ?", (sleutel,)).fetchone()
+    finally:
+        db.close()
+    return json.loads(rij[0]) if rij else None
+
+def naar_cache(sleutel, resultaten):
+    db = _cache()
+    try:
+        with db:
+            db.execute("INSERT OR REPLACE INTO geocode VALUES (?, ?, ?)",
+                       (sleutel, json.dumps(resultaten), time.time()))
+    finally:
+        db.close()
+
+# --- Offline gazetteer ---
+def lees_gazetteer(pad=GAZETTEER_PAD):
+    # Gesorteerde lijst van (genormaliseerde naam, -inwoners, resultaat). Door de
+    # sortering liggen alle namen met hetzelfde begin aaneengesloten, grootste plaats eerst.
+    index = []
+    if not Path(pad).exists():
+        return index
+    with open(pad, encoding="utf-8") as f:
+        for regel in f:
+            velden = regel.rstrip("\n").split("\t")
+            if len(velden) < 15 or velden[6] != "P":
+                continue
+            naam, lat, lon, admin1, inwoners = velden[1], velden[4], velden[5], velden[10], velden[14]
+            provincie = PROVINCIES.get(admin1)
+            display = ", ".join(d for d in (naam, provincie, "Nederland") if d)
+            resultaat = {"display_name": display, "lat": lat, "lon": lon, "bron": "gazetteer"}
+            index.append((normaliseer(naam), -int(inwoners or 0), resultaat))
+    index.sort(key=lambda x: (x[0], x[1]))
+    return index
+
+def gazetteer():
+    # Eén keer per proces inladen
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = lees_gazetteer()
+    return _gazetteer
+
+def zoek_in_gazetteer(sleutel, index=None, limit=MAX_RESULTATEN):
+    index = gazetteer() if index is None else index
+    start = bisect.bisect_left(index, (sleutel,))
+    treffers = []
+    # Per positie, geen index[start:]: dat kopieert de rest van de lijst bij elke toetsaanslag
+    for i in range(start, len(index)):
+        naam, inwoners, resultaat = index[i]
+        if not naam.startswith(sleutel):
+            break
+        treffers.append((naam != sleutel, inwoners, resultaat))
+    # Exacte naam eerst, daarna op inwonertal
+    treffers.sort(key=lambda x: (x[0], x[1]))
+    return [resultaat for _, _, resultaat in treffers[:limit]]
+
+# --- Nominatim ---
+def zoek_nominatim(query):
+    # requests pas laden als de lokale bronnen niets opleveren
+    import requests
+
+    global _laatste_nominatim
+    with _nominatim_lock:
+        wacht = _laatste_nominatim + NOMINATIM_INTERVAL - time.monotonic()
+        if wacht > 0:
+            time.sleep(wacht)
+        params = {"q": query, "format": "json", "limit": MAX_RESULTATEN, "addressdetails": 1}
+        try:
+            resp = requests.get(NOMINATIM_URL, params=params, headers={"User-Agent": "streamlit-app"}, timeout=10)
+        except requests.RequestException:
+            return None
+        finally:
+            _laatste_nominatim = time.monotonic()
+    return resp.json() if resp.status_code == 200 else None
+
+def zoek_plaats(query):
+    sleutel = normaliseer(query)
+    if not sleutel:
+        return []
+
+    resultaten = uit_cache(sleutel)
+    if resultaten is not None:
+        tel("geocode: cache")
+        return resultaten
+
+    resultaten = zoek_in_gazetteer(sleutel)
+    if resultaten:
+        tel("geocode: gazetteer")
+        return resultaten
+
+    tel("geocode: nominatim")
+    resultaten = zoek_nominatim(query)
+    if resultaten is None:
+        # Fout of rate limit: niet cachen, volgende keer opnieuw proberen
+        return []
+    naar_cache(sleutel, resultaten)
+    return resultaten
@@ -0,0 +1,101 @@
+# ------------------------------------------------- #
+# HTML-kaarten: Huidig weer en de 10-daagse kaarten #
+# ------------------------------------------------- #
+#
+# De CSS en de opmaak van de kaarten staan hier als vaste templates. Per rerun
+# worden alleen de waarden ingevuld; de CSS is één vaste string voor alle
+# kaarten en de 10 dagkaarten worden samen één HTML-blok.
+
+from datetime import timedelta
+
+# ---------------------------------------- End
+
+STIJL = """<style>
+.weather-card {
+    background: linear-gradient(100deg, #8fa3c6, #334e7c);
+    color: #f0f0f0;
+    border-radius: 15px;
+    padding: 20px;
+    text-align: center;
+    box-shadow: 0 4px 12px rgba(0,0,0,0.4);
+    width: 320px;
+    font-family: Arial, sans-serif;
+}
+.weather-card h2 { margin: 0 0 10px 0; font-size: 22px; }
+.weather-main { font-size: 40px; margin: 10px 0; }
+.weather-info { display: flex; justify-content: space-around; margin-top: 15px; font-size: 18px; }
+.weather-info div { flex: 1; text-align: center; }
+.dagkaarten { display: flex; gap: 1rem; }
+.fade-card {
+    flex: 1 1 0;
+    min-width: 0;
+    background: linear-gradient(135deg, #1e3a5f 0%, #334e7c 100%);
+    color: #f0f0f0;
+    border-radius: 12px;
+    padding: 12px;
+    text-align: center;
+    box-shadow: 0 4px 6px rgba(0,0,0,0.4);
+    transform: translateY(10px);
+    opacity: 0;
+    animation: fadeIn 0.5s forwards;
+    font-family: Arial, sans-serif;
+    letter-spacing: 0.5px;
+}
+.fade-card .date { font-weight:bold; font-size:16px; line-height:1.2; margin-bottom:3px; }
+.fade-card .subdate { font-size:14px; color:#d0d0d0; margin-bottom:5px; }
+.fade-card .emoji { font-size:28px; font-weight:bold; margin:5px 0; }
+.fade-card .temp-max { font-size:28px; font-weight:bold; margin:-5px 0; color:orange; }
+.fade-card .temp-min { font-size:18px; font-weight:bold; margin:3px 0; }
+.fade-card .desc { font-size:12px; color:#d0d0d0; margin-top:3px; }
+.fade-card .klimaat { font-size:11px; color:#a8c4e6; margin-top:3px; }
+@keyframes fadeIn { to { opacity:1; transform: translateY(0); } }
+</style>"""
+
+HUIDIG = (
+    '<div style="display:flex; justify-content:center; margin-top:15px;"><div class="weather-card">'
+    '<h2 style="margin:0; font-size:22px;">Huidig Weer</h2>'
+    '<div style="font-size:16px; color:#d0d0d0; margin-top:-15px;">{datum}</div>'
+    '<div style="font-size:16px; color:#d0d0d0; margin-top:0px;">{tijd}</div>'
+    '<div class="weather-main">{emoji}<br>{tekst}</div>'
+    '<div class="weather-info">{zonsopkomst}🌅 - {zonsondergang}🌇</div>'
+    '<div class="weather-info"><div><br><b>{temp}°C</b></div><div><br><b>{pijl} {richting}</b></div></div>'
+    '<div class="weather-info"><div><br><b>💧{neerslag} mm</b></div><div><br><b>{wind} km/h</b></div></div>'
+    '</div></div>'
+)
+
+DAGKAART = (
+    '<div class="fade-card" style="animation-delay:{vertraging:.2f}s;">'
+    '<div class="date">{dag}</div>'
+    '<div class="subdate">{datum}</div>'
+    '<div class="emoji">{emoji}</div>'
+    '<div class="temp-max">{max}°</div>'
+    '<div class="temp-min">{min}°</div>'
+    '<div class="desc">{tekst}</div>'
+    '<div class="klimaat">💧{neerslag} mm · natter dan {natter}%</div>'
+    '</div>'
+)
+
+
+# -----------------------
+# Functies
+# -----------------------
+def huidig_weer(huidig, huidig_d, vandaag, nu):
+    # huidig: rij uit uur_labels, huidig_d: rij uit df_daily
+    return HUIDIG.format(
+        datum=vandaag.strftime('%A %d %B'), tijd=nu.strftime("%H:%M"),
+        emoji=huidig['Weer emoji'], tekst=huidig['Weer tekst'],
+        zonsopkomst=huidig_d['Zonsopkomst'], zonsondergang=huidig_d['Zonsondergang'],
+        temp=huidig['Temperatuur (°C)'], pijl=huidig['Wind pijl'], richting=huidig['Wind richting'],
+        neerslag=huidig['Neerslag (mm)'], wind=huidig['Wind snelheid (km/h)'],
+    )
+
+def dagkaarten(df_daily, vandaag, aantal=10):
+    # Alle dagkaarten in één flex-rij, dus één element in plaats van 10 kolommen
+    kaarten = []
+    for i, row in enumerate(df_daily.head(aantal).itertuples()):
+        dag = vandaag + timedelta(days=i+1)
+        kaarten.append(DAGKAART.format(
+            vertraging=i * 0.05, dag=dag.strftime('%A'), datum=dag.strftime('%d %B'),
+            emoji=row._4, max=row._3, min=row._2, tekst=row._5, neerslag=row._8, natter=row._9,
+        ))
+    return '<div class="dagkaarten">' + "".join(kaarten) + '</div>'
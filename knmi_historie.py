@@ -0,0 +1,178 @@
+# ------------------------------------------- #
+# Historische neerslag uit KNMI-stationsdata  #
+# ------------------------------------------- #
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------- End
+
+MAP = Path(__file__).resolve().parent
+SCHELLINGWOUDE_CSV = MAP / "CSV_SCHELLINGWOUDE.csv"
+CACHE_MAP = MAP / ".cache_knmi"
+
+# KNMI-export: ';' als scheiding, BOM in de header, YYYYMMDD-datums en de
+# dagsom neerslag in tienden van millimeters. Aan het eind staan lege ';'-regels.
+CSV_OPTIES = {"sep": ";", "encoding": "utf-8-sig", "dtype": {"Datum": "Int64", "Column2": "float64"}}
+
+
+# -----------------------
+# Functies
+# -----------------------
+def schoon_knmi(ruw, datum="Datum", waarde="Column2"):
+    # Eén (deel van een) ingelezen export naar een float32-reeks in mm op datum.
+    # Lege regels vallen weg; een ontbrekende meting wordt NaN. KNMI schrijft
+    # -1 voor "minder dan 0.05 mm", dat telt als 0.
+    ruw = ruw.dropna(subset=[datum])
+    datums = pd.to_datetime(ruw[datum].astype("int64").astype(str), format="%Y%m%d")
+    waarden = np.maximum(ruw[waarde].to_numpy(dtype=np.float32, na_value=np.nan), 0) / np.float32(10)
+    return pd.Series(waarden, index=pd.DatetimeIndex(datums, name="Datum"), name="Neerslag (mm)")
+
+def lees_knmi_csv(pad):
+    return schoon_knmi(pd.read_csv(pad, **CSV_OPTIES))
+
+# -----------------------
+# Dagstore: vaste stap, memory-mapped
+# -----------------------
+# Eén float32 per dag, index 0 = 1883-04-01 (de eerste dag van Schellingwoude).
+# Dag d staat dus altijd op positie d - STORE_BEGIN; ontbrekende dagen zijn NaN.
+# Het bestand is een gewone .npy, zodat np.load(mmap_mode="r") het zonder
+# parse-stap opent en alle processen dezelfde pagina's uit de page cache delen.
+STORE_BEGIN = np.datetime64("1883-04-01", "D")
+
+def dag_offset(datums):
+    dagen = pd.DatetimeIndex(datums).to_numpy().astype("datetime64[D]")
+    return (dagen - STORE_BEGIN).astype(np.int64)
+
+def _store_pad(pad, cache_map):
+    # Naam plus een hash van het volledige pad: twee exports met dezelfde
+    # bestandsnaam in verschillende mappen krijgen elk een eigen store
+    bron = Path(pad).resolve()
+    return Path(cache_map) / f"{bron.stem}-{hashlib.sha1(str(bron).encode()).hexdigest()[:12]}.npy"
+
+def schrijf_dagstore(reeks, pad, mtime_ns=None):
+    # Schrijft naar een eigen tijdelijk bestand en zet dat in één keer op zijn
+    # plek, zodat gelijktijdige workers elkaar niet overschrijven en een lezer
+    # nooit een half bestand ziet. mtime_ns: de mtime die de store meekrijgt.
+    offset = dag_offset(reeks.index)
+    if len(offset) and offset.min() < 0:
+        raise ValueError(f"Reeks begint vóór {STORE_BEGIN}")
+    pad = Path(pad)
+    pad.parent.mkdir(parents=True, exist_ok=True)
+    fd, tijdelijk = tempfile.mkstemp(dir=pad.parent, prefix=pad.stem + ".", suffix=".npy")
+    os.close(fd)
+    try:
+        store = np.lib.format.open_memmap(tijdelijk, mode="w+", dtype=np.float32,
+                                          shape=(int(offset.max()) + 1 if len(offset) else 0,))
+        store[:] = np.nan
+        store[offset] = reeks.to_numpy(dtype=np.float32)
+        store.flush()
+        del store
+        if mtime_ns is not None:
+            os.utime(tijdelijk, ns=(mtime_ns, mtime_ns))
+        os.replace(tijdelijk, pad)
+    except BaseException:
+        Path(tijdelijk).unlink(missing_ok=True)
+        raise
+
+def open_dagstore(pad):
+    # Alleen-lezen view op het bestand; slicen kopieert niets
+    return np.load(pad, mmap_mode="r")
+
+def als_reeks(store):
+    # De store als Series op datum, zonder de waarden te kopiëren. Dagen vóór
+    # de eerste meting van het station vallen weg (ook een view).
+    begin = int(np.argmax(~np.isnan(store))) if len(store) else 0
+    index = pd.date_range(STORE_BEGIN + begin, periods=len(store) - begin, freq="D", name="Datum")
+    return pd.Series(store[begin:], index=index, name="Neerslag (mm)", copy=False)
+
+def zelfde_periode(store, datum, dagen=7):
+    # "Zelfde week in alle jaren": per jaar een view van `dagen` dagen vanaf
+    # dezelfde kalenderdatum. Jaren waarin de periode buiten de store valt,
+    # of waar 29 februari niet bestaat, worden overgeslagen.
+    datum = pd.Timestamp(datum)
+    views = {}
+    for jaar in range(1883, datum.year + 1):
+        try:
+            start = int(dag_offset([datum.replace(year=jaar)])[0])
+        except ValueError:
+            continue
+        if 0 <= start and start + dagen <= len(store):
+            views[jaar] = store[start:start + dagen]
+    return views
+
+def laad_neerslag(pad=SCHELLINGWOUDE_CSV, cache_map=CACHE_MAP):
+    # De eerste keer wordt de CSV omgezet naar een dagstore (.npy). Zolang de
+    # mtime van de bron gelijk is aan die van de store (zie os.utime hieronder),
+    # opent een herstart of een ander worker-proces alleen een memory map.
+    pad = Path(pad)
+    mtime = os.stat(pad).st_mtime_ns
+    store = _store_pad(pad, cache_map)
+
+    if not store.exists() or os.stat(store).st_mtime_ns != mtime:
+        schrijf_dagstore(lees_knmi_csv(pad), store, mtime)
+    return als_reeks(open_dagstore(store))
+
+
+# -----------------------
+# Klimatologie per kalenderdag
+# -----------------------
+# Kalenderdag 0..365 volgens een schrikkeljaar, zodat 29 februari een eigen plek heeft
+DAGEN_VOOR_MAAND = np.array([0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335])
+PERCENTIELEN = np.array([10, 25, 50, 75, 90, 95, 99])
+
+def kalenderdag(datums):
+    datums = pd.DatetimeIndex(datums)
+    return DAGEN_VOOR_MAAND[datums.month.to_numpy() - 1] + datums.day.to_numpy() - 1
+
+def maak_klimatologie(reeks, venster=7):
+    # Histogram per kalenderdag over alle jaren, opgeteld over een venster van
+    # +/- `venster` dagen. Alle statistieken volgen daarna uit dat ene array.
+    reeks = reeks.dropna()
+    dag = kalenderdag(reeks.index)
+    tienden = np.clip(np.round(reeks.to_numpy() * 10), 0, None).astype(np.int64)
+    # Eén extra bak boven het record, voor "natter dan alles wat er ooit viel"
+    bakken = int(tienden.max()) + 2
+
+    telling = np.bincount(dag * bakken + tienden, minlength=366 * bakken).reshape(366, bakken)
+    telling = sum(np.roll(telling, k, axis=0) for k in range(-venster, venster + 1))
+
+    cum = np.cumsum(telling, axis=1)
+    n = cum[:, -1]
+    mm = np.arange(bakken) / 10
+
+    # Percentage van de dagen in het venster met minder neerslag dan elke bak
+    minder = np.hstack([np.zeros((366, 1), dtype=cum.dtype), cum[:, :-1]])
+    natter_dan = np.round(100 * minder / n[:, None]).astype(np.uint8)
+
+    percentielen = np.stack([(cum >= p / 100 * n[:, None]).argmax(axis=1) for p in PERCENTIELEN], axis=1)
+
+    return {
+        "venster": venster,
+        "jaren": (reeks.index.min().year, reeks.index.max().year),
+        "gemiddelde": ((telling @ mm) / n).astype(np.float32),
+        "percentielen": (percentielen / 10).astype(np.float32),
+        "record": (bakken - 1 - (telling[:, ::-1] > 0).argmax(axis=1)).astype(np.float32) / 10,
+        "natter_dan": natter_dan,
+    }
+
+def natter_dan(klimatologie, datums, neerslag):
+    # O(1) per dag: directe index in de tabel op (kalenderdag, tienden mm)
+    tabel = klimatologie["natter_dan"]
+    tienden = np.round(np.nan_to_num(np.asarray(neerslag, dtype=np.float64)) * 10)
+    tienden = np.clip(tienden, 0, tabel.shape[1] - 1).astype(np.intp)
+    return tabel[kalenderdag(datums), tienden]
+
+def annoteer_dagen(df_daily, klimatologie):
+    df = df_daily.copy()
+    datums = pd.to_datetime(df["Datum"])
+    dag = kalenderdag(datums)
+    df["Natter dan (%)"] = natter_dan(klimatologie, datums, df["Neerslag (mm)"])
+    df["Gemiddeld (mm)"] = np.round(klimatologie["gemiddelde"][dag], 1)
+    df["Record (mm)"] = klimatologie["record"][dag]
+    return df
@@ -0,0 +1,127 @@
+# ------------------------------------------------ #
+# Klimatologie voor veel stations, over alle cores #
+# ------------------------------------------------ #
+#
+# Batchjob voor een map met KNMI-stationsexports in het formaat van
+# CSV_SCHELLINGWOUDE.csv. Per station (één station per worker-proces):
+#   - jaartotalen van de volledige jaren,
+#   - herhalingstijden van extreme dagneerslag (Gumbel-fit op de jaarmaxima),
+#   - trends in jaartotaal en jaarmaximum (kleinste kwadraten en Sen).
+# Alles komt in één tabel met één rij per station.
+#
+# Gebruik:
+#   python knmi_stations.py data/knmi/ -o stations.parquet
+#   python knmi_stations.py data/knmi/ -o stations.csv --processen 8
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from knmi_historie import laad_neerslag
+
+# ---------------------------------------- End
+
+# Een jaar telt mee als er op minstens zoveel dagen gemeten is
+MIN_DAGEN_PER_JAAR = 360
+HERHALINGSTIJDEN = [2, 5, 10, 25, 50, 100]
+EULER = 0.5772156649
+
+
+# -----------------------
+# Statistiek per station
+# -----------------------
+def gumbel(jaarmaxima):
+    # Methode van momenten: locatie mu en schaal beta
+    beta = np.std(jaarmaxima, ddof=1) * np.sqrt(6) / np.pi
+    return np.mean(jaarmaxima) - EULER * beta, beta
+
+def herhalingswaarden(mu, beta, jaren=HERHALINGSTIJDEN):
+    # Dagneerslag die gemiddeld eens per T jaar overschreden wordt
+    return mu - beta * np.log(-np.log(1 - 1 / np.asarray(jaren, dtype=np.float64)))
+
+def trend_per_decennium(jaren, waarden):
+    return 10 * np.polyfit(jaren, waarden, 1)[0]
+
+def sen_per_decennium(jaren, waarden):
+    # Mediaan van alle paarsgewijze hellingen; robuust voor uitschieters
+    i, j = np.triu_indices(len(jaren), k=1)
+    return 10 * np.median((waarden[j] - waarden[i]) / (jaren[j] - jaren[i]))
+
+def station_statistiek(pad):
+    # Draait in een worker-proces. laad_neerslag gebruikt de dagstore, dus
+    # een tweede run slaat het CSV-parsen over.
+    reeks = laad_neerslag(pad).astype(np.float64)
+    per_jaar = reeks.groupby(reeks.index.year).agg(["sum", "max", "count"])
+    volledig = per_jaar[per_jaar["count"] >= MIN_DAGEN_PER_JAAR]
+    jaren = volledig.index.to_numpy(dtype=np.float64)
+    totalen, maxima = volledig["sum"].to_numpy(), volledig["max"].to_numpy()
+
+    rij = {
+        "station": Path(pad).stem,
+        "begin": int(reeks.index.min().year),
+        "eind": int(reeks.index.max().year),
+        "jaren": len(volledig),
+        "ontbrekend (%)": 100 * reeks.isna().mean(),
+        "jaartotaal (mm)": np.mean(totalen) if len(totalen) else np.nan,
+        "jaartotaal sd (mm)": np.std(totalen, ddof=1) if len(totalen) > 1 else np.nan,
+        "max dag (mm)": reeks.max(),
+    }
+    if len(volledig) >= 3:
+        mu, beta = gumbel(maxima)
+        rij["gumbel mu"], rij["gumbel beta"] = mu, beta
+        for t, waarde in zip(HERHALINGSTIJDEN, herhalingswaarden(mu, beta)):
+            rij[f"T{t} (mm)"] = waarde
+        rij["trend totaal (mm/10j)"] = trend_per_decennium(jaren, totalen)
+        rij["sen totaal (mm/10j)"] = sen_per_decennium(jaren, totalen)
+        rij["trend max (mm/10j)"] = trend_per_decennium(jaren, maxima)
+    return rij
+
+def samenvatting(rijen):
+    # Compact: stationsnaam als categorical, jaartallen als int16, de rest float32
+    df = pd.DataFrame(rijen).sort_values("station", ignore_index=True)
+    df["station"] = df["station"].astype("category")
+    for kolom in df.columns[1:]:
+        df[kolom] = df[kolom].astype(np.int16 if kolom in ("begin", "eind", "jaren") else np.float32)
+    return df
+
+
+# -----------------------
+# Batch
+# -----------------------
+def bereken_stations(paden, processen=None):
+    # Eén station per taak; de volgorde van de uitvoer hangt niet af van de workers
+    paden = list(paden)
+    if processen == 1:
+        return samenvatting(map(station_statistiek, paden))
+    with ProcessPoolExecutor(max_workers=processen or os.cpu_count()) as pool:
+        return samenvatting(pool.map(station_statistiek, paden))
+
+def main():
+    parser = argparse.ArgumentParser(description="Klimatologie per KNMI-station, parallel over alle cores")
+    parser.add_argument("map", type=Path, help="map met stations-CSV's")
+    parser.add_argument("-o", "--uitvoer", type=Path, default=Path("stations.parquet"), help=".parquet of .csv")
+    parser.add_argument("--patroon", default="*.csv")
+    parser.add_argument("--processen", type=int, help="standaard: aantal cores")
+    args = parser.parse_args()
+
+    paden = sorted(args.map.glob(args.patroon))
+    if not paden:
+        sys.exit(f"Geen bestanden gevonden in {args.map} ({args.patroon})")
+
+    start = time.perf_counter()
+    df = bereken_stations(paden, args.processen)
+    if args.uitvoer.suffix == ".csv":
+        df.to_csv(args.uitvoer, index=False, sep=";")
+    else:
+        df.to_parquet(args.uitvoer, index=False)
+    print(f"{len(df)} stations in {time.perf_counter() - start:.1f} s -> {args.uitvoer}")
+
+
+if __name__ == "__main__":
+    main()
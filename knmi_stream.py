@@ -0,0 +1,225 @@
+# ------------------------------------------------- #
+# KNMI-stationsexports in stukken: begrensd geheugen #
+# ------------------------------------------------- #
+#
+# Voor exports die te groot zijn om in één keer met pd.read_csv te lezen.
+# De CSV wordt in stukken van vaste grootte gelezen (met dezelfde opschoning
+# als knmi_historie), en elk stuk gaat langs een rij
+# aggregaties die hun toestand bijhouden tussen de stukken door. Het geheugen
+# hangt daardoor af van de stukgrootte en het aantal maanden, niet van het bestand.
+#
+# Twee indelingen worden herkend:
+#   - de export zoals CSV_SCHELLINGWOUDE.csv (';', kolommen Datum en Column2);
+#   - de KNMI-daggegevens en -uurgegevens (etmgeg_*.txt, uurgeg_*.txt): ',' met
+#     een kopregel "# STN,YYYYMMDD,...", neerslag in kolom RH. Uurdata wordt per
+#     dag opgeteld; een dag die over twee stukken valt, wordt eerst samengevoegd.
+#
+# Gebruik:
+#   python knmi_stream.py CSV_SCHELLINGWOUDE.csv
+#   python knmi_stream.py etmgeg_240.txt --rijen 50000
+#   python knmi_stream.py uurgeg_240_2011-2020.txt
+
+import argparse
+import heapq
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from knmi_historie import CSV_OPTIES, schoon_knmi
+
+# ---------------------------------------- End
+
+STUK_RIJEN = 100_000
+# Zo ver wordt in een KNMI-txt naar de kopregel gezocht
+MAX_KOP_REGELS = 500
+# Een dag met minder dan 1 mm neerslag telt als droog (KNMI-definitie)
+DROOG_GRENS = 1.0
+TOP = 10
+
+
+# -----------------------
+# Inlezen in stukken
+# -----------------------
+def knmi_indeling(pad):
+    # (read_csv-opties, datumkolom, neerslagkolom, uurdata?) op basis van het begin van het bestand
+    with open(pad, encoding="latin-1") as f:
+        for nummer, regel in enumerate(f):
+            if nummer >= MAX_KOP_REGELS:
+                break
+            if regel.lstrip("# ").startswith("STN,"):
+                namen = [naam.strip() for naam in regel.lstrip("#").split(",")]
+                opties = {"sep": ",", "encoding": "latin-1", "skiprows": nummer + 1, "header": None, "names": namen}
+                return opties, "YYYYMMDD", "RH", "HH" in namen
+    return {k: v for k, v in CSV_OPTIES.items() if k != "dtype"}, "Datum", "Column2", False
+
+def _per_dag(stukken):
+    # Uursommen per dag; de laatste dag van een stuk kan in het volgende doorlopen
+    rest = None
+    for reeks in stukken:
+        dagen = reeks.groupby(level=0).sum(min_count=1)
+        if rest is not None:
+            dagen = pd.concat([rest, dagen]).groupby(level=0).sum(min_count=1)
+        rest = dagen.iloc[-1:]
+        if len(dagen) > 1:
+            yield dagen.iloc[:-1]
+    if rest is not None:
+        yield rest
+
+def lees_knmi_stukken(pad, rijen=STUK_RIJEN, datum=None, waarde=None):
+    # Generator: per stuk een float32-reeks in mm op datum, in bestandsvolgorde.
+    # datum/waarde: andere kolommen dan de standaard van de herkende indeling.
+    opties, standaard_datum, standaard_waarde, uurdata = knmi_indeling(pad)
+    datum, waarde = datum or standaard_datum, waarde or standaard_waarde
+    opties = {**opties, "dtype": {datum: "Int64", waarde: "float64"}, "usecols": [datum, waarde]}
+
+    def stukken():
+        with pd.read_csv(pad, chunksize=rijen, skipinitialspace=True, **opties) as lezer:
+            for ruw in lezer:
+                reeks = schoon_knmi(ruw, datum, waarde)
+                if len(reeks):
+                    yield reeks
+
+    yield from _per_dag(stukken()) if uurdata else stukken()
+
+
+# -----------------------
+# Incrementele aggregaties
+# -----------------------
+class MaandTotalen:
+    # Som per (jaar, maand) plus het aantal dagen met en zonder meting
+    def __init__(self):
+        self.totalen = None
+
+    def voeg_toe(self, reeks):
+        # In float64 optellen: over 140 jaar lopen float32-afrondingen op
+        reeks = reeks.astype(np.float64)
+        stuk = reeks.groupby([reeks.index.year, reeks.index.month]).agg(["sum", "count", "size"])
+        self.totalen = stuk if self.totalen is None else self.totalen.add(stuk, fill_value=0)
+
+    def resultaat(self):
+        if self.totalen is None:
+            return pd.DataFrame(columns=["Neerslag (mm)", "Dagen", "Ontbrekend"])
+        df = self.totalen.rename_axis(["Jaar", "Maand"])
+        return pd.DataFrame({
+            "Neerslag (mm)": df["sum"].round(1),
+            "Dagen": df["count"].astype(int),
+            "Ontbrekend": (df["size"] - df["count"]).astype(int),
+        })
+
+class Extremen:
+    # Natste dagen (top N) en het maximum per jaar
+    def __init__(self, top=TOP):
+        self.top = top
+        self.natste = []
+        self.per_jaar = None
+
+    def voeg_toe(self, reeks):
+        reeks = reeks.dropna()
+        for dag, mm in reeks.nlargest(self.top).items():
+            item = (round(float(mm), 1), dag.date())
+            if len(self.natste) < self.top:
+                heapq.heappush(self.natste, item)
+            else:
+                heapq.heappushpop(self.natste, item)
+        jaarmax = reeks.groupby(reeks.index.year).max()
+        self.per_jaar = jaarmax if self.per_jaar is None else self.per_jaar.combine(jaarmax, max, fill_value=0)
+
+    def resultaat(self):
+        natste = pd.DataFrame(sorted(self.natste, reverse=True), columns=["Neerslag (mm)", "Datum"])
+        per_jaar = pd.Series(dtype=np.float32) if self.per_jaar is None else self.per_jaar
+        return natste, per_jaar.rename_axis("Jaar").rename("Max dag (mm)")
+
+class DrogePeriodes:
+    # Aaneengesloten droge dagen. Een ontbrekende meting of een gat in de datums
+    # breekt de reeks af; een reeks die aan het eind van een stuk nog loopt,
+    # gaat mee naar het volgende stuk.
+    def __init__(self, grens=DROOG_GRENS, top=TOP):
+        self.grens = grens
+        self.top = top
+        self.langste = []
+        self.lengtes = {}
+        self.begin = None
+        self.lengte = 0
+        self.vorige = None
+
+    def _bewaar(self, lengtes, beginnen):
+        for lengte, aantal in zip(*np.unique(lengtes, return_counts=True)):
+            self.lengtes[int(lengte)] = self.lengtes.get(int(lengte), 0) + int(aantal)
+        for i in np.argsort(lengtes)[-self.top:]:
+            item = (int(lengtes[i]), pd.Timestamp(beginnen[i]).date())
+            if len(self.langste) < self.top:
+                heapq.heappush(self.langste, item)
+            else:
+                heapq.heappushpop(self.langste, item)
+
+    def _sluit(self):
+        if self.lengte:
+            self._bewaar(np.array([self.lengte]), [self.begin])
+        self.begin, self.lengte = None, 0
+
+    def voeg_toe(self, reeks):
+        datums = reeks.index.to_numpy().astype("datetime64[D]")
+        droog = reeks.to_numpy() < self.grens
+        vorige = np.concatenate([[datums[0] - 2 if self.vorige is None else self.vorige], datums[:-1]])
+        aansluitend = (datums - vorige) == np.timedelta64(1, "D")
+        vorige_droog = np.concatenate([[self.lengte > 0], droog[:-1]])
+
+        # Elke droge dag die niet aan een droge vorige dag vastzit, begint een nieuwe reeks
+        loopt_door = droog & aansluitend & vorige_droog
+        starts = np.flatnonzero(droog & ~loopt_door)
+        lengtes = np.bincount(np.cumsum(droog & ~loopt_door)[droog], minlength=len(starts) + 1)
+
+        # Id 0: de reeks uit het vorige stuk
+        self.lengte += int(lengtes[0])
+        if not loopt_door.all():
+            self._sluit()
+
+        if len(starts):
+            # De laatste reeks loopt nog als de laatste dag droog is
+            open_ = droog[-1]
+            klaar = slice(1, len(starts) + (0 if open_ else 1))
+            self._bewaar(lengtes[klaar], datums[starts][klaar.start - 1:klaar.stop - 1])
+            if open_:
+                self.begin, self.lengte = datums[starts[-1]], int(lengtes[-1])
+        self.vorige = datums[-1]
+
+    def resultaat(self):
+        self._sluit()
+        langste = pd.DataFrame(sorted(self.langste, reverse=True), columns=["Dagen", "Begin"])
+        verdeling = pd.Series(self.lengtes, name="Aantal", dtype=int).sort_index().rename_axis("Dagen")
+        return langste, verdeling
+
+
+def verwerk(stukken, aggregaties):
+    # Voert elk stuk langs alle aggregaties; er is steeds maar één stuk in het geheugen
+    for reeks in stukken:
+        for aggregatie in aggregaties:
+            aggregatie.voeg_toe(reeks)
+    return [aggregatie.resultaat() for aggregatie in aggregaties]
+
+
+# -----------------------
+# Command line
+# -----------------------
+def main():
+    parser = argparse.ArgumentParser(description="Maandtotalen, extremen en droge periodes uit een KNMI-export")
+    parser.add_argument("pad", type=Path)
+    parser.add_argument("--rijen", type=int, default=STUK_RIJEN, help="rijen per stuk")
+    parser.add_argument("--datum", help="kolom met YYYYMMDD (standaard: Datum, of YYYYMMDD in een KNMI-txt)")
+    parser.add_argument("--waarde", help="kolom met neerslag in 0.1 mm (standaard: Column2, of RH in een KNMI-txt)")
+    args = parser.parse_args()
+
+    maanden, (natste, per_jaar), (droog, _) = verwerk(
+        lees_knmi_stukken(args.pad, args.rijen, args.datum, args.waarde),
+        [MaandTotalen(), Extremen(), DrogePeriodes()],
+    )
+    jaren = maanden.groupby(level="Jaar")["Neerslag (mm)"].sum()
+    print(f"{len(maanden)} maanden, {jaren.index.min()}-{jaren.index.max()}, "
+          f"gemiddeld {jaren.mean():.0f} mm per jaar\n")
+    print("Natste dagen:\n" + natste.to_string(index=False) + "\n")
+    print("Langste droge periodes:\n" + droog.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# ---------------------------------------------- #
+# Meten per rerun: tijd per sectie en cachetellers #
+# ---------------------------------------------- #
+#
+# Gebruik in een Streamlit-script:
+#   begin_rerun()                        # bovenaan
+#   with meet("geocode"): ...            # om elke sectie of externe call
+#   tel("fig2: gebouwd")                 # losse tellers
+#   rapporteer()                         # onderaan
+#
+#   @fragment("kaart")                   # st.fragment; een fragment-rerun wordt
+#   def kaart(...): ...                  # als eigen (kleine) rerun gemeten
+#
+# Meten gebeurt altijd (een perf_counter per sectie); rapporteren alleen als
+# WEER_PROFIEL aanstaat ("paneel", "log" of "paneel,log"), of met ?profiel=1
+# in de URL voor het zijpaneel. "log" schrijft één JSON-regel per rerun naar stderr.
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# ---------------------------------------- End
+
+PROFIEL = {p.strip() for p in os.environ.get("WEER_PROFIEL", "").split(",") if p.strip()}
+
+# Elke Streamlit-sessie draait zijn script in een eigen thread
+_lokaal = threading.local()
+
+
+# -----------------------
+# Meten
+# -----------------------
+def begin_rerun(script=""):
+    _lokaal.rerun = {
+        "script": script,
+        "start": time.perf_counter(),
+        "secties": [],
+        "tellers": {},
+        "diepte": 0,
+    }
+
+def _huidig():
+    return getattr(_lokaal, "rerun", None)
+
+@contextmanager
+def meet(naam):
+    # Buiten een rerun (bv. in een achtergrondthread) wordt niets bijgehouden
+    rerun = _huidig()
+    if rerun is None:
+        yield
+        return
+    sectie = [naam, rerun["diepte"], 0.0]
+    rerun["secties"].append(sectie)
+    rerun["diepte"] += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        sectie[2] = (time.perf_counter() - start) * 1000
+        rerun["diepte"] -= 1
+
+def tel(naam, aantal=1):
+    rerun = _huidig()
+    if rerun is not None:
+        rerun["tellers"][naam] = rerun["tellers"].get(naam, 0) + aantal
+
+def _fragment_rerun():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return bool(ctx and ctx.fragment_ids_this_run)
+
+def fragment(naam, run_every=None):
+    # st.fragment plus meet(naam). Draait alleen het fragment opnieuw (een widget
+    # erin veranderd), dan is dat een eigen rerun met een eigen rapport.
+    import streamlit as st
+
+    def decorator(functie):
+        @functools.wraps(functie)
+        def sectie(*args, **kwargs):
+            los = _fragment_rerun()
+            if los:
+                begin_rerun(f"fragment: {naam}")
+            with meet(naam):
+                functie(*args, **kwargs)
+            if los:
+                rapporteer()
+        return st.fragment(sectie, run_every=run_every)
+    return decorator
+
+
+# -----------------------
+# Rapporteren
+# -----------------------
+def samenvatting():
+    rerun = _huidig()
+    if rerun is None:
+        return {}
+    return {
+        "script": rerun["script"],
+        "tijd": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "totaal_ms": round((time.perf_counter() - rerun["start"]) * 1000, 1),
+        "secties": [{"sectie": naam, "diepte": diepte, "ms": round(ms, 1)} for naam, diepte, ms in rerun["secties"]],
+        "tellers": dict(rerun["tellers"]),
+    }
+
+def _paneel(overzicht):
+    import streamlit as st
+
+    titel = overzicht["script"] if overzicht["script"].startswith("fragment") else "Rerun"
+    with st.sidebar.expander(f"⏱️ {titel}: {overzicht['totaal_ms']:.0f} ms", expanded=True):
+        regels = [f"{'  ' * s['diepte']}{s['sectie']:<{24 - 2 * s['diepte']}}{s['ms']:>8.1f} ms"
+                  for s in overzicht["secties"]]
+        regels += [f"{naam:<24}{aantal:>8}" for naam, aantal in overzicht["tellers"].items()]
+        st.code("\n".join(regels), language=None)
+
+def rapporteer():
+    import streamlit as st
+
+    paneel = "paneel" in PROFIEL or st.query_params.get("profiel") == "1"
+    if not (paneel or "log" in PROFIEL):
+        return
+    overzicht = samenvatting()
+    if "log" in PROFIEL:
+        print(json.dumps(overzicht, ensure_ascii=False), file=sys.stderr, flush=True)
+    if paneel:
+        _paneel(overzicht)
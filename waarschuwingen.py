@@ -0,0 +1,252 @@
+# ------------------------------------------------------- #
+# Waarschuwingen: drempels over veel locaties tegelijk    #
+# ------------------------------------------------------- #
+#
+# De uurverwachtingen van alle locaties worden gestapeld tot arrays van
+# (locatie x uur) per kolom, met dezelfde kolommen en afronding als
+# maak_dataframes. Elke regel is daarna één NumPy-bewerking over de hele
+# stapel: een voortschrijdende som via cumsum en aaneengesloten uren via de
+# randen van het masker (run-length). Tussen twee verversingen houdt een
+# Waarschuwingen-object bij wat er al gemeld is, zodat alleen nieuwe,
+# gewijzigde en vervallen waarschuwingen naar buiten komen.
+#
+# Gebruik:
+#   python waarschuwingen.py Amsterdam=52.37,4.89 Utrecht=52.09,5.12
+#   python waarschuwingen.py Amsterdam=52.37,4.89 --regels regels.json --elke 900
+#
+# Een regel: {"naam": "zware regen", "kolom": "Neerslag (mm)", "teken": ">",
+#             "drempel": 10, "uren": 3, "som": true}
+#   som=true   de som over `uren` aaneengesloten uren gaat over de drempel
+#   som=false  de waarde zelf zit minstens `uren` uur achter elkaar over de drempel
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from weerdata import TIJDZONE, haal_verwachtingen
+
+# ---------------------------------------- End
+
+# Kolomnaam zoals in maak_dataframes -> Open-Meteo uurvariabele
+KOLOMMEN = {
+    "Temperatuur (°C)": "temperature_2m",
+    "Neerslag (mm)": "rain",
+    "Wind snelheid (km/h)": "wind_speed_10m",
+}
+
+REGELS = [
+    {"naam": "zware regen", "kolom": "Neerslag (mm)", "teken": ">", "drempel": 10.0, "uren": 3, "som": True},
+    {"naam": "harde wind", "kolom": "Wind snelheid (km/h)", "teken": ">", "drempel": 62.0, "uren": 2, "som": False},
+    {"naam": "vorst", "kolom": "Temperatuur (°C)", "teken": "<", "drempel": 0.0, "uren": 3, "som": False},
+]
+
+UUR = 3600
+
+
+# -----------------------
+# Stapelen
+# -----------------------
+def stapel(verwachtingen):
+    # {naam: lees_response-dict} -> {"locaties", "time_utc", kolom: (locatie, uur) float32}.
+    # De tijdas is de vereniging van alle locaties; ontbrekende uren blijven NaN.
+    namen = list(verwachtingen)
+    assen = [np.asarray(d["hourly"]["time_utc"], dtype=np.int64) for d in verwachtingen.values()]
+    time_utc = np.unique(np.concatenate(assen)) if assen else np.array([], dtype=np.int64)
+    stapels = {kolom: np.full((len(namen), len(time_utc)), np.nan, dtype=np.float32) for kolom in KOLOMMEN}
+    for i, (data, as_) in enumerate(zip(verwachtingen.values(), assen)):
+        posities = np.searchsorted(time_utc, as_)
+        for kolom, var in KOLOMMEN.items():
+            stapels[kolom][i, posities] = data["hourly"][var]
+    for kolom in KOLOMMEN:
+        # Zelfde afronding als de getoonde tabel, dus zelfde waarschuwing als wat je ziet
+        stapels[kolom] = np.round(stapels[kolom], 1)
+    return {"locaties": namen, "time_utc": time_utc, **stapels}
+
+
+# -----------------------
+# Regels
+# -----------------------
+def controleer_regel(regel):
+    if regel.get("kolom") not in KOLOMMEN:
+        raise ValueError(f"{regel.get('naam')}: onbekende kolom {regel.get('kolom')!r}, kies uit {', '.join(KOLOMMEN)}")
+    if regel.get("teken") not in (">", "<"):
+        raise ValueError(f"{regel.get('naam')}: teken moet '>' of '<' zijn")
+    if int(regel.get("uren", 1)) < 1:
+        raise ValueError(f"{regel.get('naam')}: uren moet minstens 1 zijn")
+
+def _venster_som(waarden, uren):
+    cumsum = np.concatenate([np.zeros((len(waarden), 1)), np.cumsum(waarden, axis=1)], axis=1)
+    return cumsum[:, uren:] - cumsum[:, :-uren]
+
+def voortschrijdende_som(waarden, uren):
+    # Som over de laatste `uren` uur, per rij, via één cumsum. De eerste
+    # uren-1 uren hebben geen volledig venster en worden NaN, net als elk
+    # venster met een ontbrekend uur.
+    waarden = waarden.astype(np.float64)
+    ontbreekt = np.isnan(waarden)
+    som = np.full(waarden.shape, np.nan)
+    som[:, uren - 1:] = np.where(_venster_som(ontbreekt, uren) > 0, np.nan, _venster_som(np.where(ontbreekt, 0, waarden), uren))
+    return som
+
+def reeksen(masker):
+    # Aaneengesloten True-stukken per rij -> (rij, begin, eind) met eind exclusief
+    rand = np.zeros((len(masker), 1), dtype=bool)
+    sprongen = np.diff(np.concatenate([rand, masker, rand], axis=1).astype(np.int8), axis=1)
+    rij, begin = np.nonzero(sprongen == 1)
+    _, eind = np.nonzero(sprongen == -1)
+    return rij, begin, eind
+
+def evalueer_regel(stapels, regel):
+    # Alle waarschuwingen van één regel over alle locaties: (rij, begin, eind, piek, afgekapt).
+    # begin/eind zijn posities op de tijdas (eind exclusief). Afgekapt: het uur vóór
+    # de reeks ontbreekt, dus de reeks kan eerder begonnen zijn dan de data laat zien.
+    uren = int(regel.get("uren", 1))
+    waarden = stapels[regel["kolom"]]
+    criterium = voortschrijdende_som(waarden, uren) if regel.get("som") else waarden.astype(np.float64)
+    with np.errstate(invalid="ignore"):
+        masker = criterium > regel["drempel"] if regel["teken"] == ">" else criterium < regel["drempel"]
+
+    rij, begin, eind = reeksen(masker)
+    if not regel.get("som"):
+        lang_genoeg = eind - begin >= uren
+        rij, begin, eind = rij[lang_genoeg], begin[lang_genoeg], eind[lang_genoeg]
+    piek = _piek(criterium, rij, begin, eind, np.maximum if regel["teken"] == ">" else np.minimum)
+    afgekapt = (begin == 0) | np.isnan(criterium[rij, np.maximum(begin - 1, 0)])
+    if regel.get("som"):
+        # Een venster dat op uur t eindigt, begint uren-1 uur eerder
+        begin = begin - (uren - 1)
+    return rij, begin, eind, piek, afgekapt
+
+def _piek(criterium, rij, begin, eind, reduceer):
+    # Piek (of dal) per reeks met één reduceat over de platte array
+    if not len(rij):
+        return np.array([])
+    n = criterium.shape[1]
+    plat = np.append(criterium.ravel(), 0)
+    randen = np.column_stack([rij * n + begin, rij * n + eind]).ravel()
+    return reduceer.reduceat(plat, randen)[::2]
+
+def _huidig_uur():
+    return int(time.time()) // UUR * UUR
+
+def evalueer(stapels, regels=REGELS, vanaf=None):
+    # Alle regels over de hele stapel. Reeksen die vóór `vanaf` (UTC-seconden,
+    # standaard het huidige uur) afgelopen zijn, tellen niet meer mee.
+    vanaf = _huidig_uur() if vanaf is None else vanaf
+    time_utc = stapels["time_utc"]
+    rijen = []
+    if not len(time_utc):
+        return rijen
+    for regel in regels:
+        controleer_regel(regel)
+        rij, begin, eind, piek, afgekapt = evalueer_regel(stapels, regel)
+        # Via de tijdas zelf, zodat een gat in de as de tijden niet verschuift
+        begin_utc = time_utc[begin]
+        eind_utc = time_utc[eind - 1] + UUR
+        actueel = eind_utc > vanaf
+        for r, b, e, p, a in zip(rij[actueel], begin_utc[actueel], eind_utc[actueel], piek[actueel], afgekapt[actueel]):
+            rijen.append((stapels["locaties"][r], regel["naam"], int(b), int(e), round(float(p), 1), bool(a)))
+    return rijen
+
+
+# -----------------------
+# Incrementeel
+# -----------------------
+class Waarschuwingen:
+    # Houdt de gemelde waarschuwingen bij. Een waarschuwing is dezelfde als hij
+    # voor dezelfde locatie en regel in de tijd overlapt met een eerdere; schuift
+    # het begin, het eind of de piek, dan is hij gewijzigd.
+    def __init__(self, regels=REGELS):
+        for regel in regels:
+            controleer_regel(regel)
+        self.regels = regels
+        self.teken = {regel["naam"]: regel["teken"] for regel in regels}
+        # (locatie, regel) -> lijst van (begin, eind, piek)
+        self.actief = {}
+
+    def _bijwerken(self, regel, oud, begin, eind, piek, afgekapt):
+        # Een afgekapte reeks (begon vóór het eerste uur in de data, bv. na de
+        # verschuiving van het verwachtingsvenster om middernacht) houdt het
+        # begin en de piek van wat eerder gemeld is
+        if not afgekapt:
+            return begin, eind, piek
+        extreem = max if self.teken[regel] == ">" else min
+        return min(oud[0], begin), eind, extreem(oud[2], piek)
+
+    def ververs(self, stapels, vanaf=None, locaties=None):
+        # Geeft een DataFrame met alleen de nieuwe, gewijzigde en vervallen waarschuwingen.
+        # Wat gewoon voorbij is, verdwijnt zonder melding. Alleen de `locaties` die
+        # echt geëvalueerd zijn (standaard: die in de stapel) kunnen vervallen; van
+        # een locatie waarvan het ophalen mislukte blijft de vorige toestand staan.
+        vanaf = _huidig_uur() if vanaf is None else vanaf
+        locaties = set(stapels["locaties"] if locaties is None else locaties)
+        nu = {sleutel: reeks for sleutel, reeks in self.actief.items() if sleutel[0] not in locaties}
+        meldingen = []
+        gevonden = {}
+        for locatie, regel, begin, eind, piek, afgekapt in evalueer(stapels, self.regels, vanaf):
+            gevonden.setdefault((locatie, regel), []).append((begin, eind, piek, afgekapt))
+
+        for sleutel in gevonden.keys() | {s for s in self.actief if s[0] in locaties}:
+            oud = list(self.actief.get(sleutel, []))
+            for begin, eind, piek, afgekapt in gevonden.get(sleutel, []):
+                match = next((o for o in oud if o[0] < eind and begin < o[1]), None)
+                if match is None:
+                    nieuw = (begin, eind, piek)
+                    meldingen.append((*sleutel, *nieuw, "nieuw"))
+                else:
+                    oud.remove(match)
+                    nieuw = self._bijwerken(sleutel[1], match, begin, eind, piek, afgekapt)
+                    if match != nieuw:
+                        meldingen.append((*sleutel, *nieuw, "gewijzigd"))
+                nu.setdefault(sleutel, []).append(nieuw)
+            meldingen += [(*sleutel, *o, "vervallen") for o in oud if o[1] > vanaf]
+        self.actief = nu
+        return als_tabel(meldingen)
+
+def als_tabel(meldingen):
+    df = pd.DataFrame(meldingen, columns=["Locatie", "Waarschuwing", "Begin", "Eind", "Piek", "Status"])
+    df.insert(4, "Uren", (df["Eind"] - df["Begin"]) // UUR)
+    for kolom in ("Begin", "Eind"):
+        df[kolom] = pd.to_datetime(df[kolom], unit="s", utc=True).dt.tz_convert(TIJDZONE)
+    return df.sort_values(["Begin", "Locatie", "Waarschuwing"], ignore_index=True)
+
+
+# -----------------------
+# Command line
+# -----------------------
+def _locatie(tekst):
+    naam, coord = tekst.split("=")
+    lat, lon = coord.split(",")
+    return naam, float(lat), float(lon)
+
+def main():
+    parser = argparse.ArgumentParser(description="Waarschuwingen voor zware regen, harde wind en vorst over veel locaties")
+    parser.add_argument("locaties", nargs="+", type=_locatie, help="naam=lat,lon")
+    parser.add_argument("--regels", help="JSON-bestand met een lijst regels (standaard: REGELS)")
+    parser.add_argument("--elke", type=float, help="blijf verversen, elke zoveel seconden")
+    args = parser.parse_args()
+
+    regels = REGELS
+    if args.regels:
+        with open(args.regels, encoding="utf-8") as f:
+            regels = json.load(f)
+    monitor = Waarschuwingen(regels)
+
+    while True:
+        verwachtingen, ontbrekend = haal_verwachtingen(args.locaties)
+        if ontbrekend:
+            print(f"Geen verwachting voor {', '.join(ontbrekend)}; hun waarschuwingen blijven staan")
+        meldingen = monitor.ververs(stapel(verwachtingen))
+        print(f"{time.strftime('%H:%M:%S')}  {len(meldingen)} meldingen, {sum(map(len, monitor.actief.values()))} actief")
+        if len(meldingen):
+            print(meldingen.to_string(index=False))
+        if not args.elke:
+            break
+        time.sleep(args.elke)
+
+
+if __name__ == "__main__":
+    main()
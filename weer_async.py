@@ -0,0 +1,152 @@
+# --------------------------------------------------- #
+# Async fetch-laag: gelijktijdig ophalen en prefetchen #
+# --------------------------------------------------- #
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+from weercache import verwachtingen_cache
+from weerdata import OM_URL, lees_response, verwachting_params
+
+# ---------------------------------------- End
+
+# Eén pool met keep-alive verbindingen voor het hele proces
+MAX_VERBINDINGEN = 20
+TIMEOUT = 30
+# Zo lang wacht een script- of API-thread op een download zonder laatst goede
+# versie; daarna een lege verwachting (fout) en loopt de download op de achtergrond door
+WACHT_TIMEOUT = 20
+RETRIES = 5
+BACKOFF = 0.2
+
+# Achtergrondverversing: locaties die het afgelopen uur bekeken zijn worden
+# ververst zodra hun verwachting verloopt. De vervaltijd valt samen met het
+# beschikbaar komen van een nieuwe modelrun; eerder ophalen levert nog de oude run op.
+HOT_VENSTER = 3600
+VERVERS_INTERVAL = 30
+
+_loop = None
+_client = None
+_lock = threading.Lock()
+# Sleutel -> concurrent.futures.Future van een download die nog loopt
+_onderweg = {}
+
+
+# -----------------------
+# Event loop en client
+# -----------------------
+def _event_loop():
+    # Streamlit-scripts draaien zonder event loop. Daarom één loop in een
+    # achtergrondthread, waar alle sessies hun coroutines op zetten.
+    global _loop, _client
+    with _lock:
+        if _loop is None:
+            import httpx
+
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="weer-async", daemon=True).start()
+            limieten = httpx.Limits(max_connections=MAX_VERBINDINGEN, max_keepalive_connections=MAX_VERBINDINGEN)
+            _client = httpx.AsyncClient(limits=limieten, timeout=TIMEOUT)
+            asyncio.run_coroutine_threadsafe(_ververs_lus(), _loop)
+    return _loop
+
+def _lees_berichten(data):
+    # Open-Meteo stuurt per locatie een FlatBuffers-bericht met 4 bytes lengte ervoor
+    from openmeteo_sdk.WeatherApiResponse import WeatherApiResponse
+
+    berichten, pos = [], 0
+    while pos < len(data):
+        lengte = int.from_bytes(data[pos:pos + 4], "little")
+        berichten.append(WeatherApiResponse.GetRootAs(data, pos + 4))
+        pos += lengte + 4
+    return berichten
+
+
+# -----------------------
+# Coroutines
+# -----------------------
+async def download_verwachting(lat, lon):
+    import httpx
+
+    params = {**verwachting_params(lat, lon), "format": "flatbuffers"}
+    resp = None
+    for poging in range(RETRIES):
+        try:
+            resp = await _client.get(OM_URL, params=params)
+        except httpx.HTTPError:
+            resp = None
+        if resp is not None and resp.status_code < 500:
+            break
+        await asyncio.sleep(BACKOFF * 2 ** poging)
+
+    if resp is None or resp.status_code != 200:
+        return {}
+    return lees_response(_lees_berichten(resp.content)[0])
+
+async def _ververs_lus():
+    while True:
+        await asyncio.sleep(VERVERS_INTERVAL)
+        ververs_hot_set()
+
+async def _download_en_cache(sleutel):
+    data = await download_verwachting(*sleutel)
+    if data:
+        # Voor Last-Modified in api.py
+        data["opgehaald"] = time.time()
+        verwachtingen_cache.put(sleutel, data)
+    return data
+
+
+# -----------------------
+# Functies voor het (synchrone) Streamlit-script
+# -----------------------
+def _start(sleutel):
+    # Start een download voor `sleutel`, tenzij er al een loopt
+    with _lock:
+        future = _onderweg.get(sleutel)
+        if future is None:
+            future = asyncio.run_coroutine_threadsafe(_download_en_cache(sleutel), _loop)
+            _onderweg[sleutel] = future
+            future.add_done_callback(lambda _: _onderweg.pop(sleutel, None))
+    return future
+
+def prefetch_verwachtingen(punten):
+    # Speculatief: haal alvast de verwachting op voor alle kandidaten uit
+    # zoek_plaats, zodat een andere keuze in de selectbox direct klaar is.
+    _event_loop()
+    for lat, lon in punten:
+        sleutel = verwachtingen_cache.sleutel(lat, lon)
+        # vers() telt niet als bekeken, anders komen alle kandidaten in de hot set
+        if not verwachtingen_cache.vers(sleutel):
+            _start(sleutel)
+
+def ververs_hot_set():
+    # Start een verversing voor elke recent bekeken locatie die verlopen is
+    nu = verwachtingen_cache.klok()
+    for sleutel, verloopt in verwachtingen_cache.hot(HOT_VENSTER):
+        if verloopt <= nu:
+            _start(sleutel)
+
+def haal_verwachting(lat, lon):
+    # Vers uit de cache, of wachten op de (eventueel al lopende) download.
+    # Is de verwachting verlopen, dan komt direct de laatst goede versie terug
+    # met "verouderd": True, en wordt op de achtergrond een nieuwe opgehaald.
+    # Gevraagd wordt altijd het roosterpunt, zodat plekken vlak bij elkaar
+    # dezelfde cache-entry en dezelfde upstream-request delen.
+    _event_loop()
+    sleutel = verwachtingen_cache.sleutel(lat, lon)
+    data, verlopen = verwachtingen_cache.get_verouderd(sleutel)
+    if data is None:
+        try:
+            data = _start(sleutel).result(timeout=WACHT_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            return {}
+        # put zet "laatst bekeken" niet; pas nu heeft een aanroeper hem gezien
+        verwachtingen_cache.bekeken(sleutel)
+        return data
+    if verlopen:
+        _start(sleutel)
+        return {**data, "verouderd": True}
+    return data
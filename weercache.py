@@ -0,0 +1,162 @@
+# -------------------------------------------- #
+# Gedeelde verwachtingscache voor het proces   #
+# -------------------------------------------- #
+
+import threading
+import time
+from collections import OrderedDict
+
+from meting import tel
+
+# ---------------------------------------- End
+
+# Het knmi_seamless-model rekent op een rooster van ongeveer 2,5 km. Plekken
+# binnen dezelfde roostercel krijgen dezelfde verwachting en dus dezelfde sleutel.
+GRID_GRAAD = 0.025
+
+# KNMI HARMONIE draait elk uur; Open-Meteo heeft een nieuwe run er ongeveer
+# een kwartier later in staan. Een verwachting verloopt op dat moment.
+MODEL_RUN_INTERVAL = 3600
+MODEL_VERTRAGING = 15 * 60
+
+# Zo lang na het verlopen mag een verwachting nog als "laatst goede" getoond
+# worden terwijl er een nieuwe wordt opgehaald
+MAX_VEROUDERD = 6 * 3600
+
+
+# -----------------------
+# Functies
+# -----------------------
+def snap(waarde, grid=GRID_GRAAD):
+    return round(round(waarde / grid) * grid, 4)
+
+def volgende_modelrun(nu=None):
+    # Eerste moment na `nu` waarop een nieuwe modelrun beschikbaar is
+    nu = time.time() if nu is None else nu
+    vorige = (nu - MODEL_VERTRAGING) // MODEL_RUN_INTERVAL * MODEL_RUN_INTERVAL
+    return vorige + MODEL_RUN_INTERVAL + MODEL_VERTRAGING
+
+
+class WeerCache:
+    # Thread-safe LRU-cache met een vervaltijd per item. Streamlit draait elke
+    # sessie in een eigen thread binnen hetzelfde proces, dus één instantie op
+    # moduleniveau wordt door alle gebruikers gedeeld.
+
+    def __init__(self, max_items=256, klok=time.time, naam=None):
+        # naam: hits/misses worden ook per rerun geteld (meting.tel), alleen in
+        # de thread die de lookup doet, dus nooit die van andere sessies
+        self.naam = naam
+        self.max_items = max_items
+        self.klok = klok
+        # sleutel -> [waarde, verloopt, laatst bekeken]; alleen get, get_verouderd
+        # en bekeken zetten "laatst bekeken", put niet (prefetch is geen bezoek)
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.verouderd = 0
+        self.evictions = 0
+
+    @staticmethod
+    def sleutel(lat, lon, *extra):
+        return (snap(lat), snap(lon)) + extra
+
+    def _item(self, sleutel, nu):
+        # Verlopen items blijven nog MAX_VEROUDERD seconden bewaard als "last good"
+        item = self._items.get(sleutel)
+        if item is not None and item[1] + MAX_VEROUDERD <= nu:
+            del self._items[sleutel]
+            return None
+        return item
+
+    def get(self, sleutel):
+        with self._lock:
+            nu = self.klok()
+            item = self._item(sleutel, nu)
+            if item is None or item[1] <= nu:
+                self.misses += 1
+                self._tel("misses")
+                return None
+            self._items.move_to_end(sleutel)
+            item[2] = nu
+            self.hits += 1
+            self._tel("hits")
+            return item[0]
+
+    def get_verouderd(self, sleutel):
+        # Stale-while-revalidate: geeft (waarde, verlopen). Een verlopen waarde
+        # wordt toch teruggegeven; de aanroeper zorgt voor een verversing.
+        with self._lock:
+            nu = self.klok()
+            item = self._item(sleutel, nu)
+            if item is None:
+                self.misses += 1
+                self._tel("misses")
+                return None, True
+            self._items.move_to_end(sleutel)
+            item[2] = nu
+            verlopen = item[1] <= nu
+            if verlopen:
+                self.verouderd += 1
+                self._tel("verouderd")
+            else:
+                self.hits += 1
+                self._tel("hits")
+            return item[0], verlopen
+
+    def _tel(self, soort):
+        if self.naam:
+            tel(f"{self.naam}: {soort}")
+
+    def put(self, sleutel, waarde, verloopt=None):
+        nu = self.klok()
+        verloopt = volgende_modelrun(nu) if verloopt is None else verloopt
+        with self._lock:
+            oud = self._items.get(sleutel)
+            self._items[sleutel] = [waarde, verloopt, oud[2] if oud else 0]
+            self._items.move_to_end(sleutel)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def bekeken(self, sleutel):
+        # Markeer als bekeken, bv. nadat een download de aanroeper bereikt heeft
+        with self._lock:
+            item = self._items.get(sleutel)
+            if item is not None:
+                item[2] = self.klok()
+
+    def vers(self, sleutel):
+        # Is er een niet-verlopen waarde? Zonder hits/misses te tellen en zonder
+        # "laatst bekeken" te zetten
+        with self._lock:
+            item = self._items.get(sleutel)
+            return item is not None and item[1] > self.klok()
+
+    def haal(self, sleutel, functie):
+        # Uit de cache, of via `functie()` ophalen. Lege resultaten (fouten) niet bewaren.
+        waarde = self.get(sleutel)
+        if waarde is None:
+            waarde = functie()
+            if waarde:
+                self.put(sleutel, waarde)
+                self.bekeken(sleutel)
+        return waarde
+
+    def hot(self, venster):
+        # Sleutels die de afgelopen `venster` seconden bekeken zijn, met hun vervaltijd
+        with self._lock:
+            grens = self.klok() - venster
+            return [(sleutel, item[1]) for sleutel, item in self._items.items() if item[2] >= grens]
+
+    def leeg(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "verouderd": self.verouderd,
+                    "evictions": self.evictions, "items": len(self._items)}
+
+
+verwachtingen_cache = WeerCache(naam="verwachtingen")
@@ -0,0 +1,68 @@
+# ----------------------------------------- #
+# Weercodes en windrichting, gevectoriseerd #
+# ----------------------------------------- #
+
+import numpy as np
+
+# ---------------------------------------- End
+
+# WMO-weercodes lopen van 0 t/m 99. Index 100 is de plek voor onbekende codes.
+ONBEKEND = 100
+
+EMOJI = {
+    0: "☀️", 1: "🌤️", 2: "🌤️", 3: "☁️", 45: "🌫️", 48: "🌨️",
+    51: "🌦️", 53: "🌦️", 55: "🌧️", 56: "🌧️❄️", 57: "🌧️❄️",
+    61: "🌧️", 63: "🌧️", 65: "🌧️🌧️", 66: "🌧️❄️", 67: "🌧️❄️",
+    71: "❄️", 73: "❄️❄️", 75: "❄️❄️❄️", 77: "❄️",
+    80: "🌦️", 81: "🌦️", 82: "⛈️", 85: "🌨️", 86: "🌨️❄️",
+    95: "⛈️", 96: "⛈️🌨️", 99: "⛈️🌨️"
+}
+
+OMSCHRIJVING = {
+    0: "Zonnig", 1: "Overwegend zonnig", 2: "Gedeeltelijk bewolkt", 3: "Bewolkt",
+    45: "Mist", 48: "IJzelmist",
+    51: "Motregen licht", 53: "Motregen", 55: "Motregen zwaar",
+    61: "Regen licht", 63: "Regen", 65: "Regen zwaar",
+    71: "Sneeuw licht", 73: "Sneeuw", 75: "Sneeuw zwaar",
+    80: "Buien licht", 81: "Buien", 82: "Hevige buien",
+    95: "Onweer", 96: "Onweer met hagel", 99: "Zwaar onweer"
+}
+
+# Index 8 is de plek voor een ontbrekende (NaN) windrichting
+WIND_PIJLEN = np.array(["↓","↙","←","↖","↑","↗","→","↘", ""], dtype=object)
+WIND_RICHTINGEN = np.array(["N", "NO", "O", "ZO", "Z", "ZW", "W", "NW", ""], dtype=object)
+
+def _tabel(mapping, onbekend):
+    tabel = np.full(ONBEKEND + 1, onbekend, dtype=object)
+    for code, label in mapping.items():
+        tabel[code] = label
+    return tabel
+
+EMOJI_TABEL = _tabel(EMOJI, "❓")
+OMSCHRIJVING_TABEL = _tabel(OMSCHRIJVING, "Onbekend")
+
+
+# -----------------------
+# Functies
+# -----------------------
+def code_index(codes):
+    # Weercodes (ook float32 uit de FlatBuffers-API) naar een index in de tabellen
+    codes = np.asarray(codes, dtype=np.float64)
+    geldig = np.isfinite(codes) & (codes >= 0) & (codes < ONBEKEND) & (codes == np.floor(codes))
+    return np.where(geldig, codes, ONBEKEND).astype(np.intp)
+
+def richting_index(graden):
+    graden = np.asarray(graden, dtype=np.float64)
+    return np.where(np.isfinite(graden), np.round(graden / 45) % 8, 8).astype(np.intp)
+
+def weercode_emojis(codes):
+    return EMOJI_TABEL[code_index(codes)]
+
+def weercode_omschrijvingen(codes):
+    return OMSCHRIJVING_TABEL[code_index(codes)]
+
+def wind_pijlen(graden):
+    return WIND_PIJLEN[richting_index(graden)]
+
+def windrichtingen_cardinaal(graden):
+    return WIND_RICHTINGEN[richting_index(graden)]
@@ -0,0 +1,260 @@
+# ------------------------------------------ #
+# Open-Meteo verwachting: één fetch per plek #
+# ------------------------------------------ #
+
+import logging
+import os
+import threading
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from weercodes import (EMOJI_TABEL, OMSCHRIJVING_TABEL, WIND_PIJLEN, WIND_RICHTINGEN, code_index, richting_index,
+                       weercode_emojis, weercode_omschrijvingen)
+from weercache import verwachtingen_cache
+
+# ---------------------------------------- End
+
+# Via OPEN_METEO_URL kan een andere server gebruikt worden, bv. benchmarks/standin_server.py
+OM_URL = os.environ.get("OPEN_METEO_URL", "https://api.open-meteo.com/v1/forecast")
+
+# De volgorde van de variabelen is belangrijk: de FlatBuffers-response geeft
+# ze terug in dezelfde volgorde als waarin ze gevraagd zijn.
+DAILY_VARS = ["temperature_2m_max", "temperature_2m_min", "weather_code", "sunrise", "sunset", "precipitation_sum"]
+HOURLY_VARS = ["temperature_2m", "rain", "weather_code", "wind_speed_10m", "wind_direction_10m"]
+
+# Alle tijden in het dashboard zijn Nederlandse tijd, inclusief zomertijd
+TIJDZONE = "Europe/Amsterdam"
+
+# sunrise/sunset komen als unix-timestamps (int64) binnen, de rest als float32.
+# Ze blijven in UTC; pas bij het tonen naar Nederlandse tijd (zie _uur_minuut)
+INT64_VARS = {"sunrise", "sunset"}
+
+# Zoveel coördinaten passen ruim in één request-URL
+MAX_LOCATIES_PER_REQUEST = 50
+
+log = logging.getLogger(__name__)
+
+# De Open-Meteo client wordt pas bij de eerste fetch gebouwd (zie openmeteo_client)
+_openmeteo = None
+_openmeteo_lock = threading.Lock()
+
+
+# -----------------------
+# Functies
+# -----------------------
+def openmeteo_client():
+    # Open-Meteo client met retry, één keer per proces. openmeteo_requests en
+    # retry_requests worden pas hier geïmporteerd, zodat ze de opstarttijd niet raken.
+    # Het cachen gebeurt in weercache.verwachtingen_cache.
+    global _openmeteo
+    with _openmeteo_lock:
+        if _openmeteo is None:
+            import openmeteo_requests
+            import requests
+            from retry_requests import retry
+
+            retry_session = retry(requests.Session(), retries = 5, backoff_factor = 0.2)
+            _openmeteo = openmeteo_requests.Client(session = retry_session)
+    return _openmeteo
+
+def weather_api(params):
+    # Lijst met FlatBuffers-responses, of None als Open-Meteo een fout gaf
+    from openmeteo_requests import OpenMeteoRequestsError
+
+    try:
+        return openmeteo_client().weather_api(OM_URL, params=params)
+    except OpenMeteoRequestsError:
+        return None
+
+def verwachting_params(lat, lon):
+    return {
+        "latitude": lat, "longitude": lon,
+        "daily": DAILY_VARS,
+        "hourly": HOURLY_VARS,
+        "models": "knmi_seamless",
+        "timezone": TIJDZONE,
+        "forecast_days": 10
+    }
+
+def lees_blok(blok, namen, offset):
+    # Tijdas in UTC-seconden, plus de lokale (naïeve) tijd zoals de JSON-API die gaf
+    utc = np.arange(blok.Time(), blok.TimeEnd(), blok.Interval(), dtype=np.int64)
+    data = {
+        "time": (utc + offset).astype("datetime64[s]"),
+        "time_utc": utc,
+    }
+    for i, naam in enumerate(namen):
+        var = blok.Variables(i)
+        if naam in INT64_VARS:
+            # Niet + offset: die geldt voor het begin van de reeks, en de 10 dagen
+            # kunnen over de wisseling van zomer- naar wintertijd heen lopen
+            data[naam] = var.ValuesInt64AsNumpy().astype("datetime64[s]")
+        else:
+            data[naam] = var.ValuesAsNumpy()
+    return data
+
+def lees_response(response):
+    # Zet een FlatBuffers-response om naar dezelfde vorm als de JSON-API:
+    # {"daily": {...}, "hourly": {...}}, maar met NumPy-arrays als waarden.
+    offset = response.UtcOffsetSeconds()
+    return {
+        "latitude": response.Latitude(),
+        "longitude": response.Longitude(),
+        "elevation": response.Elevation(),
+        "utc_offset_seconds": offset,
+        "daily": lees_blok(response.Daily(), DAILY_VARS, offset),
+        "hourly": lees_blok(response.Hourly(), HOURLY_VARS, offset),
+    }
+
+def haal_verwachtingen(locaties, per_request=MAX_LOCATIES_PER_REQUEST):
+    # locaties: lijst van (naam, lat, lon). Open-Meteo accepteert lijsten van
+    # coördinaten en geeft één response per locatie terug, in dezelfde volgorde.
+    # Alleen locaties die niet in de cache staan gaan mee in een request.
+    # Geeft (verwachtingen, ontbrekend): ontbrekend zijn de namen waarvan het ophalen mislukte.
+    dubbel = sorted(naam for naam, aantal in Counter(naam for naam, _, _ in locaties).items() if aantal > 1)
+    if dubbel:
+        raise ValueError(f"Dubbele locatienamen: {', '.join(dubbel)}")
+
+    # Namen die op hetzelfde roosterpunt vallen, delen één coördinaat in de request
+    verwachtingen, te_halen, ontbrekend = {}, {}, []
+    for naam, lat, lon in locaties:
+        sleutel = verwachtingen_cache.sleutel(lat, lon)
+        data = verwachtingen_cache.get(sleutel)
+        if data is None:
+            te_halen.setdefault(sleutel, []).append(naam)
+        else:
+            verwachtingen[naam] = data
+
+    te_halen = list(te_halen.items())
+    for start in range(0, len(te_halen), per_request):
+        stuk = te_halen[start:start + per_request]
+        params = verwachting_params([s[0] for s, _ in stuk], [s[1] for s, _ in stuk])
+        responses = weather_api(params)
+        if not responses or len(responses) != len(stuk):
+            mislukt = [naam for _, namen in stuk for naam in namen]
+            ontbrekend += mislukt
+            log.warning("Open-Meteo gaf geen verwachting voor %d locaties: %s", len(mislukt), ", ".join(mislukt))
+            continue
+        for (sleutel, namen), response in zip(stuk, responses):
+            data = lees_response(response)
+            verwachtingen_cache.put(sleutel, data)
+            for naam in namen:
+                verwachtingen[naam] = data
+
+    # Zelfde volgorde als de invoer
+    return {naam: verwachtingen[naam] for naam, _, _ in locaties if naam in verwachtingen}, ontbrekend
+
+def lang_formaat(verwachtingen, blok="hourly"):
+    # Eén DataFrame met een rij per (locatie, tijdstap)
+    frames = []
+    for naam, data in verwachtingen.items():
+        df = pd.DataFrame(data[blok])
+        df.insert(0, "locatie", naam)
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame()
+    lang = pd.concat(frames, ignore_index=True)
+    lang["locatie"] = pd.Categorical(lang["locatie"], categories=list(verwachtingen))
+    return lang
+
+def haal_verwachtingen_lang(locaties, blok="hourly"):
+    # Geeft (lang, ontbrekend), net als haal_verwachtingen
+    verwachtingen, ontbrekend = haal_verwachtingen(locaties)
+    return lang_formaat(verwachtingen, blok), ontbrekend
+
+def uur_index(hourly):
+    # Eén keer bij het laden: een gesorteerde, tz-aware index in Nederlandse
+    # tijd, afgeleid van de UTC-tijden (dus ook rond de wisseling naar/van zomertijd goed)
+    utc = pd.to_datetime(np.asarray(hourly.get("time_utc", []), dtype=np.int64), unit="s", utc=True)
+    return pd.DatetimeIndex(utc.tz_convert(TIJDZONE), name="Tijd")
+
+def komende_uren(df, uren, nu=None):
+    # De rijen van het huidige uur tot `uren` uur later. searchsorted op de
+    # index in plaats van een masker over het hele frame.
+    if df.empty:
+        return df
+    # Afronden in UTC: in het dubbele uur bij de wisseling naar wintertijd is
+    # de lokale kloktijd dubbelzinnig
+    begin = (pd.Timestamp.now(tz="UTC") if nu is None else nu.tz_convert("UTC")).floor("h")
+    start, eind = df.index.searchsorted([begin, begin + pd.Timedelta(hours=uren)])
+    return df.iloc[start:eind]
+
+def _uur_minuut(tijden):
+    # UTC-tijden -> kloktijd in Nederlandse tijd, per tijdstip de juiste (zomer)tijd
+    return pd.to_datetime(np.asarray(tijden, dtype="datetime64[s]"), utc=True).tz_convert(TIJDZONE).strftime("%H:%M")
+
+def maak_dataframes(data):
+    daily, hourly = data.get("daily", {}), data.get("hourly", {})
+    daily_codes = daily.get("weather_code", [])
+
+    df_daily = pd.DataFrame({
+    "Datum": np.datetime_as_string(np.asarray(daily.get("time", []), dtype="datetime64[D]")),
+    "Temp min (°C)": np.round(daily.get("temperature_2m_min", []), 1),
+    "Temp max (°C)": np.round(daily.get("temperature_2m_max", []), 1),
+    "Weer emoji": weercode_emojis(daily_codes),
+    "Weer tekst": weercode_omschrijvingen(daily_codes),
+    "Zonsopkomst": _uur_minuut(daily.get("sunrise", [])),
+    "Zonsondergang": _uur_minuut(daily.get("sunset", [])),
+    "Neerslag (mm)": np.round(daily.get("precipitation_sum", []), 1)
+    })
+
+
+    if not hourly:
+        return df_daily, pd.DataFrame()
+
+    # Compact: float32 getallen en de weercode/windsector als int8. De labels
+    # (emoji, tekst, pijl, richting) komen er pas bij het tonen bij, zie uur_labels.
+    df_hourly = pd.DataFrame({
+        "Temperatuur (°C)": _rond(hourly.get("temperature_2m", [])),
+        "Neerslag (mm)": _rond(hourly.get("rain", [])),
+        "Weer code": code_index(hourly.get("weather_code", [])).astype(np.int8),
+        "Wind snelheid (km/h)": _rond(hourly.get("wind_speed_10m", [])),
+        "Wind sector": richting_index(hourly.get("wind_direction_10m", [])).astype(np.int8),
+    }, index=uur_index(hourly))
+
+    return df_daily, df_hourly
+
+def _rond(waarden):
+    return np.round(np.asarray(waarden, dtype=np.float32), 1)
+
+def _als_categorie(tabel, index):
+    # Tabelindex naar een categorical met elk label maar één keer
+    labels, codes = np.unique(tabel.astype(str), return_inverse=True)
+    return pd.Categorical.from_codes(codes[index], categories=labels)
+
+def uur_labels(df_hourly):
+    # Uurtabel zoals hij getoond wordt. Roep dit aan op het stuk dat echt
+    # getoond wordt (bv. de komende 24 uur), niet op alle 240 uren.
+    code = df_hourly["Weer code"].to_numpy()
+    sector = df_hourly["Wind sector"].to_numpy()
+    df = df_hourly.drop(columns=["Weer code", "Wind sector"])
+    # float32 0.1 wordt als Python-float 0.10000000149; voor het tonen terug naar float64
+    for kolom in df.select_dtypes(np.float32):
+        df[kolom] = df[kolom].astype(np.float64).round(1)
+    df.insert(2, "Weer emoji", _als_categorie(EMOJI_TABEL, code))
+    df.insert(3, "Weer tekst", _als_categorie(OMSCHRIJVING_TABEL, code))
+    df.insert(5, "Wind richting", _als_categorie(WIND_RICHTINGEN, sector))
+    df.insert(6, "Wind pijl", _als_categorie(WIND_PIJLEN, sector))
+    return df
+
+def maak_fig2_dataframes(data):
+    # Figuur 2 werkt met de ruwe Open-Meteo kolomnamen. De index is dezelfde
+    # tz-aware index als df_hourly; "Local Time" is de kloktijd zonder tijdzone,
+    # want Plotly.js kan niet met tijdzones overweg.
+    daily, hourly = data.get("daily", {}), data.get("hourly", {})
+
+    index = uur_index(hourly)
+    hourly_dataframe = pd.DataFrame({
+        "date": index.tz_convert("UTC"),
+        "Local Time": index.tz_localize(None),
+    }, index=index)
+    for naam in HOURLY_VARS:
+        hourly_dataframe[naam] = hourly.get(naam, [])
+
+    daily_dataframe = pd.DataFrame({"date": pd.to_datetime(daily.get("time_utc", []), unit="s", utc=True)})
+    for naam in ["temperature_2m_max", "temperature_2m_min", "weather_code"]:
+        daily_dataframe[naam] = daily.get(naam, [])
+
+    return hourly_dataframe, daily_dataframe
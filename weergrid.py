@@ -0,0 +1,161 @@
+# ------------------------------------------------------ #
+# Rooster over Nederland: één bulk-download per modelrun #
+# ------------------------------------------------------ #
+#
+# In plaats van een request per gezochte plek wordt per modelrun het hele
+# Nederlandse rooster opgehaald (in requests van MAX_LOCATIES_PER_REQUEST punten)
+# en als dichte NumPy-kubussen (tijd x lat x lon) in het geheugen gehouden. De
+# verwachting voor een plek volgt dan uit bilineaire interpolatie, zonder upstream.
+# Het aantal upstream-requests per uur is zo vast, hoeveel gebruikers er ook zijn.
+#
+# Aanzetten met WEER_GRID=1. Plekken buiten het rooster gaan gewoon via haal_verwachting.
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from weercache import WeerCache
+from weerdata import DAILY_VARS, HOURLY_VARS, INT64_VARS, MAX_LOCATIES_PER_REQUEST, lees_response, verwachting_params, weather_api
+
+# ---------------------------------------- End
+
+GRID_MODUS = os.environ.get("WEER_GRID") == "1"
+
+# Nederland plus een rand, zodat ook plekken aan de grens tussen vier punten vallen.
+# 0.1 graad (~8-11 km) geeft 30 x 40 = 1200 punten, dus 24 requests per modelrun.
+LAT_MIN, LAT_MAX = 50.7, 53.6
+LON_MIN, LON_MAX = 3.3, 7.2
+GRID_STAP = 0.1
+MAX_TEGELIJK = 4
+
+# Variabelen die niet lineair te middelen zijn
+CATEGORISCH = {"weather_code"}
+RICHTING = {"wind_direction_10m"}
+
+# Eén item: de kubus van de laatste modelrun, verloopt samen met de verwachtingen
+kubus_cache = WeerCache(max_items=1, naam="rooster")
+_download_lock = threading.Lock()
+
+
+# -----------------------
+# Bulk-download
+# -----------------------
+def rooster(stap=GRID_STAP):
+    lats = np.round(np.arange(LAT_MIN, LAT_MAX + stap / 2, stap), 4)
+    lons = np.round(np.arange(LON_MIN, LON_MAX + stap / 2, stap), 4)
+    return lats, lons
+
+def _stapel(blokken, namen, vorm):
+    # Lijst van lees_blok-dicts (één per punt, rij voor rij) -> {naam: (tijd, lat, lon)}
+    kubus = {"time": blokken[0]["time"], "time_utc": blokken[0]["time_utc"]}
+    for naam in namen:
+        waarden = np.stack([b[naam] for b in blokken], axis=-1)
+        if naam in INT64_VARS:
+            waarden = waarden.astype("datetime64[s]").astype(np.int64)
+        kubus[naam] = waarden.reshape(len(kubus["time"]), *vorm)
+    return kubus
+
+def download_kubus(stap=GRID_STAP):
+    lats, lons = rooster(stap)
+    punten = [(lat, lon) for lat in lats for lon in lons]
+    stukken = [punten[i:i + MAX_LOCATIES_PER_REQUEST] for i in range(0, len(punten), MAX_LOCATIES_PER_REQUEST)]
+
+    def haal(stuk):
+        responses = weather_api(verwachting_params([p[0] for p in stuk], [p[1] for p in stuk]))
+        if not responses or len(responses) != len(stuk):
+            raise RuntimeError("Onvolledige response voor het rooster")
+        return [lees_response(r) for r in responses]
+
+    with ThreadPoolExecutor(max_workers=MAX_TEGELIJK) as pool:
+        data = [d for stuk in pool.map(haal, stukken) for d in stuk]
+
+    vorm = (len(lats), len(lons))
+    return {
+        "lats": lats, "lons": lons,
+        "opgehaald": time.time(),
+        "utc_offset_seconds": data[0]["utc_offset_seconds"],
+        "daily": _stapel([d["daily"] for d in data], DAILY_VARS, vorm),
+        "hourly": _stapel([d["hourly"] for d in data], HOURLY_VARS, vorm),
+    }
+
+def _ververs():
+    # Hooguit één download tegelijk; wie de lock niet krijgt, wacht niet
+    if not _download_lock.acquire(blocking=False):
+        return
+    try:
+        kubus_cache.put("nl", download_kubus())
+    except RuntimeError:
+        pass
+    finally:
+        _download_lock.release()
+
+def haal_kubus():
+    # De laatste kubus. Is hij verlopen, dan komt de oude terug en wordt er op
+    # de achtergrond een nieuwe opgehaald (net als weer_async.haal_verwachting).
+    kubus, verlopen = kubus_cache.get_verouderd("nl")
+    if kubus is None:
+        with _download_lock:
+            kubus = kubus_cache.get("nl")
+            if kubus is None:
+                kubus = download_kubus()
+                kubus_cache.put("nl", kubus)
+        return kubus
+    if verlopen:
+        threading.Thread(target=_ververs, name="weer-grid", daemon=True).start()
+    return kubus
+
+
+# -----------------------
+# Interpolatie
+# -----------------------
+def _gewichten(as_, waarde):
+    # Index van het punt links/onder en het gewicht van het punt rechts/boven
+    positie = (waarde - as_[0]) / (as_[1] - as_[0])
+    i = int(np.clip(np.floor(positie), 0, len(as_) - 2))
+    return i, float(np.clip(positie - i, 0, 1))
+
+def _interpoleer_blok(blok, namen, i, wi, j, wj):
+    hoeken = np.array([(1 - wi) * (1 - wj), (1 - wi) * wj, wi * (1 - wj), wi * wj])
+    data = {"time": blok["time"], "time_utc": blok["time_utc"]}
+    for naam in namen:
+        cel = blok[naam][:, i:i + 2, j:j + 2].reshape(-1, 4)
+        if naam in CATEGORISCH:
+            # Weercodes zijn categorieën: neem het dichtstbijzijnde punt
+            data[naam] = cel[:, int(np.argmax(hoeken))]
+        elif naam in RICHTING:
+            # Windrichting via de vectorcomponenten, anders wordt 350° en 10° samen 180°
+            rad = np.deg2rad(cel.astype(np.float64))
+            graden = np.rad2deg(np.arctan2(np.sin(rad) @ hoeken, np.cos(rad) @ hoeken)) % 360
+            data[naam] = graden.astype(np.float32)
+        elif naam in INT64_VARS:
+            data[naam] = np.round(cel @ hoeken).astype(np.int64).astype("datetime64[s]")
+        else:
+            data[naam] = (cel.astype(np.float64) @ hoeken).astype(np.float32)
+    return data
+
+def interpoleer(kubus, lat, lon):
+    # Verwachting voor (lat, lon) in dezelfde vorm als weerdata.lees_response,
+    # of None als de plek buiten het rooster valt
+    lats, lons = kubus["lats"], kubus["lons"]
+    if not (lats[0] <= lat <= lats[-1] and lons[0] <= lon <= lons[-1]):
+        return None
+    i, wi = _gewichten(lats, lat)
+    j, wj = _gewichten(lons, lon)
+    return {
+        "latitude": lat, "longitude": lon,
+        "opgehaald": kubus["opgehaald"],
+        "utc_offset_seconds": kubus["utc_offset_seconds"],
+        "daily": _interpoleer_blok(kubus["daily"], DAILY_VARS, i, wi, j, wj),
+        "hourly": _interpoleer_blok(kubus["hourly"], HOURLY_VARS, i, wi, j, wj),
+    }
+
+def verwachting_uit_rooster(lat, lon):
+    # None als het rooster (nog) niet beschikbaar is of de plek erbuiten valt
+    try:
+        kubus = haal_kubus()
+    except RuntimeError:
+        return None
+    return interpoleer(kubus, lat, lon)